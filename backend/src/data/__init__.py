@@ -11,11 +11,9 @@ import inspect
 
 def split_path(path: str) -> list:
     "split path elements into a list"
-    if path:
-        split = split_path(os.path.dirname(path))
-        split.append(os.path.basename(path))
-        return split
-    return []
+    if not path:
+        return []
+    return [p for p in os.path.normpath(path).split(os.sep) if p]
 
 
 base_path = os.path.dirname(__file__)
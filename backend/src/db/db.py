@@ -1,21 +1,79 @@
 """ Manage connection to the database
 """
 
+import importlib
+import os
 from contextlib import asynccontextmanager
 
 from core.app import App
 from core.status import Status
 from core.config import Config
-from db.sqlite import SQLiteDB
-from db.mysql import MySQLDB
 from db.schema_maintenance import check_db_schema
-
-# from persistance.business_object_base import BO_Base
-from data.management.db_schema import DBSchema
 from core.app_logging import getLogger
 
 LOG = getLogger(__name__)
 
+__all__ = ["get_db", "preload_driver", "SQLiteDB", "MySQLDB"]
+
+# configuration keys required by the DB drivers
+_SQLITE_KEYS = frozenset({Config.CONFIG_DB_FILE})
+_MYSQL_KEYS = frozenset(
+    {
+        Config.CONFIG_DB_HOST,
+        Config.CONFIG_DB_DB,
+        Config.CONFIG_DB_USER,
+        Config.CONFIG_DB_PW,
+    }
+)
+# map the set of configuration keys to the DB driver supporting it
+_CONFIG_SIGNATURES = {_SQLITE_KEYS: "sqlite", _MYSQL_KEYS: "mysql"}
+# library required by a DB driver
+_DRIVER_LIBRARIES = {"sqlite": "aiosqlite", "mysql": "aiomysql"}
+# module and name of the DB class of a driver
+_DRIVER_CLASSES = {"sqlite": ("db.sqlite", "SQLiteDB"), "mysql": ("db.mysql", "MySQLDB")}
+# DB classes of the drivers imported so far
+_DRIVERS = {}
+
+
+def _load_driver(driver: str) -> type:
+    "Return the DB class of a driver, the driver's module is imported on first use"
+    try:
+        return _DRIVERS[driver]
+    except KeyError:
+        module_name, class_name = _DRIVER_CLASSES[driver]
+        db_class = _DRIVERS[driver] = getattr(
+            importlib.import_module(module_name), class_name
+        )
+        return db_class
+
+
+# DB classes exported by this module, imported on first access
+_LAZY_EXPORTS = {"SQLiteDB": "sqlite", "MySQLDB": "mysql"}
+
+
+def __getattr__(name: str):
+    "Import the DB class 'name' on first access and keep it in the module"
+    driver = _LAZY_EXPORTS.get(name)
+    if driver is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    db_class = globals()[name] = _load_driver(driver)
+    return db_class
+
+
+# set HBUCH_EAGER_IMPORT=1 to import all drivers at once, e.g. to detect import errors
+if os.environ.get("HBUCH_EAGER_IMPORT") == "1":
+    for _name in _LAZY_EXPORTS:
+        __getattr__(_name)
+
+
+def preload_driver():
+    """Import the driver of the configured DB in advance.
+    Call at startup so the first 'get_db()' doesn't pay for importing the driver."""
+    if App.status == Status.STATUS_DB_CFG:
+        driver = _CONFIG_SIGNATURES.get(frozenset(App.configuration[Config.CONFIG_DB]))
+        if driver is not None:
+            _load_driver(driver)
+
 
 @asynccontextmanager
 async def get_db():
@@ -27,47 +85,30 @@ async def get_db():
 
     db_config = App.configuration[Config.CONFIG_DB]
     # LOG.debug(f"DB configuration: {db_config.keys()=}")
-    if db_config.keys() == {Config.CONFIG_DB_FILE}:
-        LOG.debug("Connect to SQLite")
-        try:
-            db = SQLiteDB(**db_config)
-        except ModuleNotFoundError as exc:
-            App.status = Status.STATUS_DB_UNSUPPORTED
-            LOG.error(f"{exc}")
-            if "aiosqlite" in str(exc):
-                LOG.error(
-                    "Library 'aiosqlite' could not be imported. "
-                    "Please install using 'pip install aiosqlite'"
-                )
-            yield
-            return
-    elif db_config.keys() == {
-        Config.CONFIG_DB_HOST,
-        Config.CONFIG_DB_DB,
-        Config.CONFIG_DB_USER,
-        Config.CONFIG_DB_PW,
-    }:
-        LOG.info("Connect to MySQL DB")
-        try:
-            db = MySQLDB(**db_config)
-        except ModuleNotFoundError as exc:
-            App.status = Status.STATUS_DB_UNSUPPORTED
-            LOG.error(f"{exc}")
-            if "aiomysql" in str(exc):
-                LOG.error(
-                    "Library 'aiomysql' could not be imported. "
-                    "Please install using 'pip install aiomysql'"
-                )
-            yield
-            return
-    else:
+    driver = _CONFIG_SIGNATURES.get(frozenset(db_config))
+    if driver is None:
         App.status = Status.STATUS_DB_UNSUPPORTED
         LOG.warning(f"Invalid DB configuration: {db_config}")
         yield
         return
+    LOG.info(f"Connect to {driver} DB")
+    try:
+        db = _load_driver(driver)(**db_config)
+    except ModuleNotFoundError as exc:
+        App.status = Status.STATUS_DB_UNSUPPORTED
+        LOG.error(f"{exc}")
+        library = _DRIVER_LIBRARIES[driver]
+        if library in str(exc):
+            LOG.error(
+                f"Library '{library}' could not be imported. "
+                f"Please install using 'pip install {library}'"
+            )
+        yield
+        return
     try:
         App.db = db
         await check_db_schema()
+        await db.prewarm()
         LOG.debug("DB ready")
         yield db
     except TypeError:
@@ -1,5 +1,10 @@
 """ Base class for DB connections """
 
+import asyncio
+import functools
+import weakref
+from contextlib import asynccontextmanager
+
 # from persistance.business_object_base import BO_Base
 from db.sqlfactory import SQLFactory
 from db.sqlexecutable import SQL, SQLTemplate
@@ -9,31 +14,146 @@ from core.app_logging import getLogger
 LOG = getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def column_definition_sql(sql_factory: SQLFactory, attr: tuple) -> str:
+    "SQL defining the column of a business object attribute in the DB dialect"
+    return sql_factory.get_sql_class(SQLColumnDefinition)(*attr).sql()
+
+
+class ConnectionPool:
+    """Pool of connections to a DB.
+    Connections released to the pool are reused by subsequent statements
+    instead of opening a new connection for each of them.
+    'factory' is a coroutine function opening a new connection,
+    at most 'max_size' connections are open, acquire() waits while all are lent,
+    and at most 'max_idle' of them (default 'max_size') are kept open while idle.
+    Lent connections are referenced until released, so they can be
+    disconnected on clear() even if their user dropped them.
+    """
+
+    def __init__(
+        self, factory, min_size: int, max_size: int, max_idle: int = None
+    ) -> None:
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_size if max_idle is None else max_idle
+        self._idle = asyncio.Queue()
+        self._lent = set()
+        # a connection is opened only if none is idle, so lending at most
+        # 'max_size' connections limits the number of open connections
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def acquire(self) -> "Connection":
+        """Return an idle connection or open a new one if none is available.
+        An idle connection is pinged first, if it was lost meanwhile
+        (e.g. closed by the server after its idle timeout) a new one is opened."""
+        await self._slots.acquire()
+        try:
+            con = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            con = None
+        if con is not None:
+            try:
+                await con.ping()
+            except Exception as exc:
+                LOG.debug(f"dropping lost pooled connection: {exc}")
+                try:
+                    await con.disconnect()
+                except Exception:
+                    pass
+                con = None
+        if con is None:
+            try:
+                con = await self._factory()
+            except BaseException:
+                self._slots.release()
+                raise
+        con._released = False
+        self._lent.add(con)
+        return con
+
+    async def release(self, con: "Connection"):
+        """Return a lent connection to the pool.
+        Connections disconnected by clear() meanwhile are not reused.
+        Connections returned while 'max_idle' connections are idle are disconnected."""
+        con._released = True
+        if con in self._lent:
+            self._lent.discard(con)
+            if self._idle.qsize() >= self.max_idle:
+                await con.disconnect()
+            else:
+                self._idle.put_nowait(con)
+            self._slots.release()
+
+    async def discard(self, con: "Connection"):
+        """Disconnect a lent connection instead of returning it to the pool,
+        as after a failure it may be left in an unusable state"""
+        con._released = True
+        if con in self._lent:
+            self._lent.discard(con)
+            self._slots.release()
+            await con.disconnect()
+
+    async def prewarm(self, n: int):
+        "Open connections in advance until 'n' connections are idle"
+        count = min(n, self.max_size - len(self._lent))
+        cons = [await self.acquire() for _ in range(count)]
+        for con in cons:
+            await con.ping()
+        for con in cons:
+            await self.release(con)
+
+    async def clear(self):
+        "Disconnect all idle and lent connections"
+        while not self._idle.empty():
+            await self._idle.get_nowait().disconnect()
+        while self._lent:
+            await self._lent.pop().disconnect()
+            self._slots.release()
+
+
 class DB:
     "application Data Base"
 
-    def __init__(self, **cfg) -> None:
+    # number of connections opened in advance, max number of open connections
+    # and max number of connections kept open while idle
+    pool_min_size = 1
+    pool_max_size = 4
+    pool_max_idle = 4
+    # renderers of DB specific SQL snippets, keyed by query
+    _sql_dispatch = {}
+
+    def __init__(self, prewarm: bool = True, **cfg) -> None:
         self._cfg = cfg
-        self._connections = set()
+        self._prewarm = prewarm
+        self._connections = weakref.WeakSet()
+        self._pool = ConnectionPool(
+            self.connect,
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size,
+            max_idle=self.pool_max_idle,
+        )
 
     @property
-    def sqlFactory(self):
+    def sql_factory(self):
         "DB specific SQL factory"
-        raise NotImplementedError("sqlFactory not defined on base class")
+        raise NotImplementedError("sql_factory not defined on base class")
 
     def sql(self, query: SQL, **kwargs) -> str:
         "return the DB specific SQL"
         # LOG.debug(f"{query=}, {kwargs=}, query is callable:{callable(query)} ")
+        render = self._sql_dispatch.get(query)
+        if render is not None:
+            return render(self, **kwargs)
         if callable(query):
             return query(self, **kwargs)
-        elif isinstance(query.value, str):
-            return query.value
         raise ValueError(f"value of {query} not defined")
 
     def check_column(self, col, attr, tab):
         "check compatibility of a DB column with a business object attribute"
         # LOG.debug(f"DB.check_column({col=}, {attr=})")
-        attr_sql = SQL().sql_factory.get_sql_class(SQLColumnDefinition)(*attr).sql()
+        attr_sql = column_definition_sql(SQL().sql_factory, tuple(attr))
         if col is None:
             LOG.error(
                 f"column '{attr[0]}' in DB table '{tab}' is undefined in the DB instead of '{attr_sql}'"
@@ -49,14 +169,19 @@ class DB:
     async def check_table(self, obj: "BOBase"):
         "check compatibility of a DB table with a business object"
         LOG.debug(f"Checking table {obj.table}")
-        tab_info = {
-            c["column_name"]: " ".join(
-                [c["column_name"], c["column_type"], c["constraint"]]
+        async with self.acquire() as con:
+            cur = await con.execute(
+                SQL().script(SQLTemplate.TABLEINFO, table=obj.table).sql()
             )
-            for c in await (
-                await SQL().script(SQLTemplate.TABLEINFO, table=obj.table).execute()
-            ).fetchall()
-        }
+            try:
+                tab_info = {
+                    c["column_name"]: " ".join(
+                        [c["column_name"], c["column_type"], c["constraint"]]
+                    )
+                    for c in await cur.fetchall()
+                }
+            finally:
+                await cur.close()
         ok = True
         for attr in obj.attribute_descriptions():
             ok = self.check_column(tab_info.get(attr[0]), attr, obj.table) and ok
@@ -66,18 +191,57 @@ class DB:
         "Open a connection and return the Connection instance"
         raise ConnectionError("Called from DB base class.")
 
-    async def execute(self, query: str, params=None, close=False, commit=False):
-        """Open a connection, execute a query and return the Cursor instance.
-        If 'close'=True close connection after fetching all rows"""
-        # LOG.debug(f"execute: {query=}, {params=}, {close=}, {commit=}")
-        return await (await self.connect()).execute(
-            query=query, params=params, close=close, commit=commit
-        )
+    @asynccontextmanager
+    async def acquire(self):
+        """Lend a connection from the pool for the duration of the context.
+        Closing it within the context only commits, on exit the connection
+        commits if requested and returns to the pool.
+        If the context raises, the connection is disconnected without commit
+        instead of returned to the pool."""
+        con = await self._pool.acquire()
+        con._held = True
+        try:
+            yield con
+        except BaseException:
+            con._held = False
+            con._commit = False
+            await self._pool.discard(con)
+            raise
+        con._held = False
+        await con.close()
+
+    async def release(self, con: "Connection"):
+        "Return a connection to the pool"
+        await self._pool.release(con)
+
+    async def prewarm(self):
+        "Fill the pool with its minimum number of connections unless disabled"
+        if self._prewarm:
+            await self._pool.prewarm(self._pool.min_size)
+
+    async def execute(self, query: str, params=None, commit=False):
+        """Take a connection from the pool, execute a query and return all rows fetched.
+        The connection returns to the pool right away. To fetch the rows through
+        a Cursor, execute the query on a connection lent by acquire()."""
+        # LOG.debug(f"execute: {query=}, {params=}, {commit=}")
+        async with self.acquire() as con:
+            cur = await con.execute(query=query, params=params, commit=commit)
+            try:
+                return await cur.fetchall()
+            finally:
+                await cur.close()
+
+    async def executemany(self, query: str, params_seq, commit=False):
+        """Take a connection from the pool and execute a query once for each set of parameters.
+        Return the number of affected rows"""
+        async with self.acquire() as con:
+            return await con.executemany(query, params_seq, commit=commit)
 
     async def close(self):
         "close all activities"
-        for con in [c for c in self._connections]:
-            await con.close()
+        await self._pool.clear()
+        for con in list(self._connections):
+            await con.disconnect()
 
 
 class Connection:
@@ -89,29 +253,52 @@ class Connection:
         self._db = db_obj
         self._db._connections.add(self)
         self._commit = commit
+        # set once the connection is returned to the pool, reset when lent again
+        self._released = False
+        # set while lent by DB.acquire(), which then releases the connection on exit
+        self._held = False
 
     async def connect(self):
         "Open a connection and return the Connection instance"
         raise ConnectionError("Called from DB base class.")
 
     async def close(self):
-        "close the connection"
-        if self._connection:
+        """commit if requested and return the connection to the DB's pool.
+        Without commit, a transaction left open is rolled back before the
+        connection returns to the pool, so the next user does not commit it.
+        Closing a connection already returned to the pool does nothing."""
+        if self._connection and not self._released:
             if self._commit:
                 await self.commit()
+                self._commit = False
+            elif not self._held:
+                await self.rollback()
+            if not self._held:
+                await self._db.release(self)
+
+    async def disconnect(self):
+        "close the connection"
+        if self._connection:
             # LOG.debug("close connection")
             await self._connection.close()
-            self._db._connections.remove(self)
+            self._db._connections.discard(self)
             self._connection = None
 
+    async def ping(self):
+        "check the connection is alive"
+
     @property
     def connection(self):
         "'real' DB connection"
         return self._connection
 
-    async def execute(self, query: str, params=None, close=False, commit=False):
-        """execute an SQL statement and return the Cursor instance.
-        If 'close'=True close connection after fetching all rows"""
+    async def execute(self, query: str, params=None, commit=False):
+        "execute an SQL statement and return the Cursor instance"
+        raise ConnectionError("Called from DB base class.")
+
+    async def executemany(self, query: str, params_seq, commit=False):
+        """execute an SQL statement once for each set of parameters
+        and return the number of affected rows"""
         raise ConnectionError("Called from DB base class.")
 
     async def commit(self):
@@ -119,6 +306,10 @@ class Connection:
         # LOG.debug("commit connection")
         await self._connection.commit()
 
+    async def rollback(self):
+        "roll back current transaction"
+        await self._connection.rollback()
+
     def __repr__(self) -> str:
         return f"connection: {self._connection}"
 
@@ -126,50 +317,42 @@ class Connection:
 class Cursor:
     "query cursor"
 
-    def __init__(self, cur=None, con=None, close=False) -> None:
+    __slots__ = (
+        "_cursor",
+        "_connection",
+        "_rowcount",
+        "_arraysize",
+    )
+
+    def __init__(self, cur=None, con=None, arraysize=256) -> None:
         self._cursor = cur
         self._connection = con
         self._rowcount = None
-        self._close = close
+        self._arraysize = arraysize
 
-    async def execute(self, query: str, params=None, close=False):
+    async def execute(self, query: str, params=None):
         """execute an SQL statement and return the Cursor instance (self).
-        If 'close'=True close connection after fetching all rows
-        If 'close'=1 close connection after fetching one row
-        If 'close'=0 close connection immediatly (used for stetemants w/o result)"""
+        The cursor is closed if the execution fails, its connection stays with
+        the caller, which releases it by leaving DB.acquire()."""
         raise ConnectionError("Called from DB base class.")
 
     @property
     async def rowcount(self):
         return self._rowcount
 
-    async def fetchone(self, commit=False):
+    async def fetchone(self):
         "fetch the next row"
-        result = await self._cursor.fetchone()
-        if self._close == 1:
-            if commit:
-                self._connection._commit = commit
-            await self.close()
-            await self._connection.close()
-        return result
+        return await self._cursor.fetchone()
 
-    async def fetchall(self, commit=False):
+    async def fetchall(self):
         "fetch all remaining rows from cursor"
-        result = await self._cursor.fetchall()
-        if self._close:
-            if commit:
-                self._connection._commit = commit
-            await self.close()
-            await self._connection.close()
-        return result
+        return await self._cursor.fetchall()
 
     async def __aiter__(self):
-        "row generator to support the iterator protocol"
-        while col := await self.fetchone() is not None:
-            yield col
-        if self._close:
-            await self._connection.close()
-        raise StopIteration
+        "row generator to support the async iterator protocol, rows are fetched in batches"
+        while rows := await self._cursor.fetchmany(self._arraysize):
+            for row in rows:
+                yield row
 
     async def close(self):
         "close the cursor"
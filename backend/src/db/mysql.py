@@ -1,62 +1,130 @@
 """ Connection to MySQL DB using aiomysql """
 
+import importlib.util
+import sys
+
 from db.db_base import DB, Connection, Cursor
 from db.sql import SQL
+from db.sqlexpression import Placeholder, BatchValues, ColumnarValues
 from db.sqlfactory import SQLFactory
 from core.config import Config
 from core.app_logging import getLogger
 
 LOG = getLogger(__name__)
 
-try:
-    import aiomysql
-except ModuleNotFoundError as err:
-    AIOMYSQL_IMPORT_ERROR = err
-else:
+# aiomysql is imported by the first connection, here only its availability is checked
+aiomysql = None
+if (
+    sys.modules.get("aiomysql") is not None
+    or importlib.util.find_spec("aiomysql") is not None
+):
     AIOMYSQL_IMPORT_ERROR = None
+else:
+    AIOMYSQL_IMPORT_ERROR = ModuleNotFoundError("No module named 'aiomysql'")
+
+
+class MySQLSQLFactory(SQLFactory):
+
+    @classmethod
+    def get_sql_class(cls, sql_cls: type):
+        for mysql_class in [MySQLPlaceholder, MySQLBatchValues, MySQLColumnarValues]:
+            if sql_cls.__name__ in [b.__name__ for b in mysql_class.__bases__]:
+                return mysql_class
+        return super().get_sql_class(sql_cls)
+
+
+class MySQLPlaceholder(Placeholder):
+    "Named parameter in the pyformat style of aiomysql ('%(name)s')"
+
+    __slots__ = ()
+
+    template = "%%(%s)s"
+
+
+class MySQLBatchValues(BatchValues):
+    "Rows of a batch INSERT bound by name in the pyformat style of aiomysql"
+
+    __slots__ = ()
+
+    template = MySQLPlaceholder.template
+
+
+class MySQLColumnarValues(ColumnarValues):
+    "Column-major rows of a batch INSERT bound by name in the pyformat style"
+
+    __slots__ = ()
+
+    template = MySQLPlaceholder.template
 
 
 class MySQLDB(DB):
+    pool_min_size = 2
+    pool_max_size = 10
+    pool_max_idle = 5
+
+    # list of tables in the database of the connection
+    TABLE_LIST_SQL = """ SELECT table_name FROM information_schema.tables
+                        WHERE table_schema = DATABASE()
+                    """
+
+    _sql_dispatch = {SQL.TABLE_LIST: lambda db, **kwargs: db.TABLE_LIST_SQL}
+
     def __init__(self, **cfg) -> None:
-        if not AIOMYSQL_IMPORT_ERROR:
-            raise ModuleNotFoundError(f"Import error: {err}")
+        if AIOMYSQL_IMPORT_ERROR:
+            raise ModuleNotFoundError(f"Import error: {AIOMYSQL_IMPORT_ERROR}")
         super().__init__(**cfg)
 
     @property
-    def sqlFactory():
-        return SQLFactory
+    def sql_factory(self):
+        return MySQLSQLFactory
 
     async def connect(self):
         "Open a connection"
         return await MySQLConnection(db_obj=self, **self._cfg).connect()
 
-    def sql(self, query: SQL, **kwargs) -> str:
-        if query == SQL.TABLE_LIST:
-            return f""" SELECT table_name FROM information_schema.tables 
-                        WHERE table_schema = '{self._cfg['db']}'
-                    """
-        else:
-            return super().sql(query=query, **kwargs)
-
 
 class MySQLConnection(Connection):
     async def connect(self):
+        global aiomysql
+        if aiomysql is None:
+            import aiomysql
         self._connection = await aiomysql.connect(
             host=self._cfg[Config.CONFIG_DB_HOST],
             db=self._cfg[Config.CONFIG_DB_DB],
             user=self._cfg[Config.CONFIG_DB_USER],
             password=self._cfg[Config.CONFIG_DB_PW],
+            # a pooled connection must not keep the snapshot of its first transaction
+            autocommit=True,
         )
         return self
 
-    async def execute(self, sql: str):
+    async def ping(self):
+        "check the connection is alive, reconnect if it was lost"
+        await self._connection.ping()
+
+    async def execute(self, query: str, params=None, commit=False):
         "execute an SQL statement and return a cursor"
+        if commit:
+            self._commit = commit
         cur = MySQLCursor(cur=await self._connection.cursor(), con=self)
-        await cur.execute(sql)
+        await cur.execute(query, params=params)
         return cur
 
+    async def executemany(self, query: str, params_seq, commit=False):
+        "execute an SQL statement for each set of parameters, return the number of affected rows"
+        if commit:
+            self._commit = commit
+        async with self._connection.cursor() as cur:
+            return await cur.executemany(query, params_seq)
+
 
 class MySQLCursor(Cursor):
+    __slots__ = ()
 
-    async def execute(self, sql: str):
-        self._rowcount = await self._cursor.execute(sql)
+    async def execute(self, query: str, params=None):
+        try:
+            self._rowcount = await self._cursor.execute(query, params)
+        except Exception:
+            await self.close()
+            raise
+        return self
@@ -1,11 +1,5 @@
 """ Manage DB schema versins and check compatibility """
 
-import core
-import db
-import persistance
-
-# import data.management
-from data.management.db_schema import DBSchema
 from core.app_logging import getLogger
 from db.sqlexecutable import SQL, SQLTemplate
 
@@ -33,15 +27,25 @@ async def check_db_schema():
     upgrade if necessary
     verify compatibility of the persistance tables
     """
+    # imported here to keep importing this module cheap
+    import core.app
+    import core.exceptions
+    import db.db_base
+    import persistance.business_object_base
+    from data.management.db_schema import DBSchema
+
     database = core.app.App.db
     if database.__class__ == db.db_base.DB:
         raise TypeError("cannot check abstract DB")
     LOG.debug("checking DB Schema")
-    cur = await SQL().script(SQLTemplate.TABLELIST).execute()
-    LOG.debug(f"Found {await cur.rowcount} tables in DB:")
-    LOG.debug(
-        f"    tables: {', '.join([t['table_name'] for t in await cur.fetchall()])}"
-    )
+    async with database.acquire() as con:
+        cur = await con.execute(SQL().script(SQLTemplate.TABLELIST).sql())
+        try:
+            tables = {t["table_name"] async for t in cur}
+        finally:
+            await cur.close()
+    LOG.debug(f"Found {len(tables)} tables in DB:")
+    LOG.debug(f"    tables: {', '.join(tables)}")
 
     all_business_objects = (
         persistance.business_object_base.BOBase.all_business_objects.values()
@@ -1,52 +1,55 @@
-""" Enumeration of SQL Snipets """
+""" SQL Snipets """
 
-from enum import Enum, auto
 from core.app_logging import getLogger
 
 LOG = getLogger(__name__)
 
 
-class SQL(Enum):
-    TABLE_LIST = auto()
-    TABLE_INFO = auto()
-    CREATE_TABLE = (
-        lambda obj, table, columns: f"""CREATE TABLE IF NOT EXISTS
+class SQL:
+    """SQL snippets rendered by DB.sql.
+    String constants are keys of DB specific snippets (see DB._sql_dispatch),
+    all other snippets are static methods rendering the SQL."""
+
+    TABLE_LIST = "TABLE_LIST"
+    TABLE_INFO = "TABLE_INFO"
+    CREATE_TABLE_COLUMN = "CREATE_TABLE_COLUMN"
+
+    @staticmethod
+    def CREATE_TABLE(obj, table, columns):
+        return f"""CREATE TABLE IF NOT EXISTS
             {table.lower()} ( {','.join(columns)} )"""
-    )
-    CREATE_TABLE_COLUMN = auto()
-
-    def SELECT(obj, table, columns=None, id=None, newest=None):
-        if not columns:
-            columns = "*"
-        if not isinstance(columns, list):
-            columns = [columns]
-        sql = "SELECT "
-        sql += ",".join(columns)
-        sql += f" FROM {table}"
-        if id:
-            sql += f" WHERE id = {id}"
-        elif newest:
-            sql += f" WHERE id = (SELECT max(id) FROM {table})"
-        return sql
 
+    @staticmethod
     def INSERT(obj, table, columns, returning=None):
-        sql = f"INSERT INTO {table} ( "
-        sql += " , ".join(columns.keys())
-        sql += " ) VALUES ( "
-        sql += " , ".join([str(v) for v in columns.values()])
-        sql += " )"
+        parts = [
+            "INSERT INTO ",
+            table,
+            " ( ",
+            " , ".join(columns.keys()),
+            " ) VALUES ( ",
+            " , ".join(map(str, columns.values())),
+            " )",
+        ]
         if returning:
-            sql += f" RETURNING {', '.join(returning)}"
-        return sql
+            parts.append(" RETURNING " + ", ".join(returning))
+        return "".join(parts)
 
+    @staticmethod
     def INSERT_ARGS(obj, table, columns, returning=None):
-        cols = ", ".join(columns.keys())
-        placeholders = ", ".join(":" + key for key in columns.keys())
-        sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
+        parts = [
+            "INSERT INTO ",
+            table,
+            " (",
+            ", ".join(columns.keys()),
+            ") VALUES (",
+            ", ".join([":" + key for key in columns.keys()]),
+            ")",
+        ]
         if returning:
-            sql += f" RETURNING {', '.join(returning)}"
-        return sql
+            parts.append(" RETURNING " + ", ".join(returning))
+        return "".join(parts)
 
+    @staticmethod
     def UPDATE_ARGS(obj, table, columns):
         update_string = ", ".join([f"{k} = :{k}" for k in columns.keys()])
         return f"UPDATE {table} SET {update_string} WHERE id = :id"
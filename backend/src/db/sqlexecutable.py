@@ -1,5 +1,7 @@
 """This module defines a SQLExecutable class that is used to create and execute SQL statements."""
 
+import string
+import sys
 from enum import Enum, auto
 from typing import List
 
@@ -10,6 +12,8 @@ from db.sqlexpression import (
     Value,
     Row,
     Values,
+    BatchValues,
+    ColumnarValues,
     From,
     Assignment,
     Where,
@@ -46,17 +50,25 @@ class SQLTemplate(Enum):
 class SQLExecutable(object):
     """Base class for SQL operations. Should not be instantiated directly."""
 
+    __slots__ = ("_parent",)
+
     def __init__(self, parent: "SQLExecutable" = None):
         self._parent = parent
 
     async def execute(
         self,
         params=None,
-        close=False,
         commit=False,
+        connection=None,
     ):
         """Execute the current SQL statement on the database."""
-        return await self._parent.execute(params=params, close=close, commit=commit)
+        return await self._parent.execute(
+            params=params, commit=commit, connection=connection
+        )
+
+    def prepare(self) -> "PreparedStatement":
+        """Freeze the current SQL statement for repeated execution."""
+        return self._parent.prepare()
 
     async def close(self):
         """Close the database connection."""
@@ -64,7 +76,7 @@ class SQLExecutable(object):
 
     def get_sql_class(self, sql_cls: type) -> type:
         """Get the speficied SQL class definition as defined by the db's SQLFactory."""
-        return self.sql_factory.get_sql_class(sql_cls)
+        return self._parent.get_sql_class(sql_cls)
 
     @property
     def sql_factory(self) -> SQLFactory:
@@ -82,11 +94,13 @@ class SQL(SQLExecutable):
         ],
     ).execute()"""
 
+    __slots__ = ("_rslt", "_sql_statement", "_sql_factory")
+
     def __init__(self):
         super().__init__(None)
         self._rslt = None
         self._sql_statement = None
-        self._sql_statment: "SQLStatement" = None
+        self._sql_factory = None
 
     @classmethod
     def _get_db(cls):
@@ -101,8 +115,16 @@ class SQL(SQLExecutable):
 
     @property
     def sql_factory(self) -> SQLFactory:
-        """Get the SQLFactory of the current database. Usually call get_sql_class instead."""
-        return self._get_db().sql_factory
+        """Get the SQLFactory of the current database. Usually call get_sql_class instead.
+        The factory is looked up once per SQL object."""
+        sql_factory = self._sql_factory
+        if sql_factory is None:
+            sql_factory = self._sql_factory = self._get_db().sql_factory
+        return sql_factory
+
+    def get_sql_class(self, sql_cls: type) -> type:
+        """Get the speficied SQL class definition as defined by the db's SQLFactory."""
+        return self.sql_factory.resolve(sql_cls)
 
     def create_table(
         self, table: str, columns: list[(str, SQLDataType)] = None
@@ -145,32 +167,167 @@ class SQL(SQLExecutable):
         )
         return self._sql_statement
 
-    async def execute(self, params=None, close=False, commit=False):
+    async def execute(self, params=None, commit=False, connection=None):
         """Execute the current SQL statement on the database.
-        Must create the statement before calling this method"""
-        if self._sql_statement is None:
+        Must create the statement before calling this method.
+        Executed on 'connection', a connection lent by DB.acquire(), return the Cursor.
+        Without a connection, return all rows fetched; the statement is executed
+        on a connection from the pool, which returns to the pool right away.
+        A statement with a rows batch binds its own parameter sets, it is executed
+        once per row and returns the number of affected rows instead."""
+        statement = self._sql_statement
+        if statement is None:
             raise InvalidSQLStatementException("No SQL statement to execute.")
-        return await self._get_db().execute(self.sql(), params, close, commit)
+        # the statement caches its rendered SQL, re-executions reuse the text
+        batch = statement.batch_params()
+        if batch is not None:
+            if params is not None:
+                raise InvalidSQLStatementException(
+                    "Parameters must not be passed with a rows batch."
+                )
+            if connection is not None:
+                return await connection.executemany(
+                    statement.sql(), batch, commit=commit
+                )
+            return await self._get_db().executemany(statement.sql(), batch, commit)
+        if params is None:
+            params = statement.bound_params()
+        if connection is not None:
+            return await connection.execute(statement.sql(), params, commit=commit)
+        return await self._get_db().execute(statement.sql(), params, commit)
+
+    def prepare(self) -> "PreparedStatement":
+        """Freeze the current SQL statement for repeated execution.
+        The statement is rendered once, executions only bind their parameters.
+        The parameters of a bound row or rows batch are kept as the defaults."""
+        statement = self._sql_statement
+        if statement is None:
+            raise InvalidSQLStatementException("No SQL statement to execute.")
+        return PreparedStatement(
+            statement.sql(),
+            self._get_db(),
+            statement.bound_params(),
+            statement.batch_params(),
+        )
 
     async def close(self):
         await self._get_db().close()
 
 
+class PreparedStatement:
+    """Rendered SQL statement bound to the database, executed with varying parameters.
+    Usage:
+    select = SQL().select(["name"]).from_("users")
+    select = select.where(Eq("id", Placeholder("id"))).prepare()
+    async with db.acquire() as con:
+        for id in ids:
+            cur = await select.execute({"id": id}, connection=con)
+            names.append((await cur.fetchone())["name"])
+            await cur.close()"""
+
+    __slots__ = ("_sql", "_db", "_params", "_batch")
+
+    def __init__(self, sql: str, db, params=None, batch=None):
+        self._sql = sql
+        self._db = db
+        # parameters used if an execution passes none, as of a bound row
+        self._params = params
+        # parameter sets used if an execution passes none, as of a rows batch
+        self._batch = batch
+
+    def sql(self) -> str:
+        """Get the frozen SQL statement."""
+        return self._sql
+
+    async def execute(self, params=None, commit=False, connection=None):
+        """Execute the statement with a set of parameters.
+        Executed on 'connection', a connection lent by DB.acquire(), return the Cursor,
+        without a connection return all rows fetched.
+        Without parameters, a statement prepared from a rows batch executes the
+        batch like executemany()."""
+        if params is None:
+            if self._batch is not None:
+                if connection is not None:
+                    return await connection.executemany(
+                        self._sql, self._batch, commit=commit
+                    )
+                return await self._db.executemany(self._sql, self._batch, commit)
+            params = self._params
+        if connection is not None:
+            return await connection.execute(self._sql, params, commit=commit)
+        return await self._db.execute(self._sql, params, commit)
+
+    async def executemany(self, params_seq=None, commit=False):
+        """Execute the statement once for each set of parameters,
+        by default the rows batch it was prepared from."""
+        if params_seq is None:
+            params_seq = self._batch
+        return await self._db.executemany(self._sql, params_seq, commit)
+
+
 class SQLStatement(SQLExecutable):
-    """Base class for SQL statements. Should not be instantiated directly."""
+    """Base class for SQL statements. Should not be instantiated directly.
+    The rendered SQL is cached; builder methods reset the cache."""
+
+    __slots__ = ("_rendered",)
+
+    def __init__(self, parent: SQLExecutable = None):
+        super().__init__(parent)
+        self._rendered = None
 
     def sql(self) -> str:
         """Get a string representation of the current SQL statement.
+        The statement is rendered on the first call and cached."""
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = self._render()
+        return rendered
+
+    def batch_params(self):
+        """Parameter sets to execute the statement with one by one (executemany),
+        None if the statement is executed once."""
+        return None
+
+    def bound_params(self):
+        """Parameters bound by the statement itself, used when executed without
+        parameters. None if the statement binds no parameters."""
+        return None
+
+    def _render(self) -> str:
+        """Render the current SQL statement as a string.
         Must be implemented by subclasses."""
         raise NotImplementedError(
             "SQL_statement is an abstract class and should not be instantiated."
         )
 
 
+def _compile_template(template: str) -> tuple[tuple[str, str | None], ...] | None:
+    """Split a str.format template into pairs of literal text and field name.
+    None if the template uses conversions, format specs or fields other than
+    plain names (auto-numbered, positional, attribute or index fields)."""
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if spec or conversion or (field is not None and not field.isidentifier()):
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
 class SQLScript(SQLStatement):
     """A SQL statement that executes a script verbatim"""
 
+    __slots__ = ("_script",)
+
     sql_templates = {}
+    # sql_templates split once per class, see _compile_template()
+    _compiled_templates = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compiled_templates = {
+            key: _compile_template(template)
+            for key, template in cls.sql_templates.items()
+        }
 
     def __init__(
         self,
@@ -182,11 +339,24 @@ class SQLScript(SQLStatement):
         self._script = (
             script_or_template
             if isinstance(script_or_template, str)
-            else self.__class__.sql_templates.get(script_or_template).format(**kwargs)
+            else self._fill_template(script_or_template, kwargs)
         )
 
-    def sql(self) -> str:
-        """Get a string representation of the current SQL statement."""
+    @classmethod
+    def _fill_template(cls, template: SQLTemplate, kwargs: dict) -> str:
+        "Fill the fields of a template, equivalent to str.format(**kwargs)"
+        compiled = cls._compiled_templates.get(template)
+        if compiled is None:
+            return cls.sql_templates.get(template).format(**kwargs)
+        return "".join(
+            [
+                literal if field is None else literal + str(kwargs[field])
+                for literal, field in compiled
+            ]
+        )
+
+    def _render(self) -> str:
+        """Render the current SQL statement as a string."""
         return self._script
 
 
@@ -194,6 +364,11 @@ class CreateTable(SQLStatement):
     """A SQLStatement representing a CREATE TABLE statement.
     Default implementation complies with SQLite syntax."""
 
+    __slots__ = ("_table", "_columns", "_columns_sql")
+
+    # %-format template filled with the table and the column definitions
+    sql_template = "CREATE TABLE %s (%s)"
+
     def __init__(
         self,
         table: str = "",
@@ -203,48 +378,90 @@ class CreateTable(SQLStatement):
         super().__init__(parent)
         cols = [] if columns is None else columns
         self._table = table
-        sql_column_definition = self.sql_factory.get_sql_class(SQLColumnDefinition)
+        sql_column_definition = self.get_sql_class(SQLColumnDefinition)
         self._columns = [
             sql_column_definition(name, data_type, constraint)
             for name, data_type, constraint in cols
         ]
+        # rendered column definitions, extended as columns are added
+        self._columns_sql = ", ".join([column.sql() for column in self._columns])
 
     def column(self, name: str, data_type: SQLDataType, constraint: str = None):
         """Add a column to the table to be created.
         The column will be added to the end of the column list."""
-        self._columns.append(
-            self.sql_factory.get_sql_class(SQLColumnDefinition)(
-                name, data_type, constraint
-            )
+        column = self.get_sql_class(SQLColumnDefinition)(name, data_type, constraint)
+        self._columns.append(column)
+        self._columns_sql = (
+            column.sql()
+            if len(self._columns) == 1
+            else self._columns_sql + ", " + column.sql()
         )
+        self._rendered = None
         return self
 
-    def sql(self) -> str:
-        """Get a string representation of the current SQL statement."""
+    def _render(self) -> str:
+        """Render the current SQL statement as a string."""
         if self._table is None or len(self._table) == 0:
             raise InvalidSQLStatementException(
                 "CREATE TABLE statement must have a table name."
             )
-        return f"CREATE TABLE {self._table} ({', '.join([column.sql() for column in self._columns])})"
+        return self.sql_template % (self._table, self._columns_sql)
 
 
 class TableValuedQuery(SQLStatement):
     """SQLStatement representing a statement that has a table as its result set.
     Should not be instantiated directly."""
 
+    __slots__ = ()
+
     def __init__(self, parent: SQLExecutable):
         super().__init__(parent)
 
-    def sql(self) -> str:
-        """Get a string representation of the current SQL statement."""
+    def _render(self) -> str:
+        """Render the current SQL statement as a string."""
         raise NotImplementedError(
             "Table_Valued_Query is an abstract class and should not be instantiated."
         )
 
 
+# bits of Select._clauses flagging the optional clauses present in a SELECT
+_SELECT_WHERE = 1
+_SELECT_GROUP_BY = 2
+_SELECT_HAVING = 4
+
+# keyword of a SELECT indexed by Select._distinct
+_SELECT_KEYWORD = (sys.intern("SELECT "), sys.intern("SELECT DISTINCT "))
+
+# keyword of the RETURNING clause of INSERT and UPDATE
+_RETURNING = sys.intern(" RETURNING ")
+
+# renderers of the optional clauses of a SELECT indexed by Select._clauses
+_SELECT_CLAUSES = (
+    lambda s: "",
+    lambda s: s._where.sql(),
+    lambda s: s._group_by.sql(),
+    lambda s: s._where.sql() + s._group_by.sql(),
+    lambda s: s._having.sql(),
+    lambda s: s._where.sql() + s._having.sql(),
+    lambda s: s._group_by.sql() + s._having.sql(),
+    lambda s: f"{s._where.sql()}{s._group_by.sql()}{s._having.sql()}",
+)
+
+
 class Select(TableValuedQuery):
     """Represents a SQL Select Statement. Default implementation complies with SQLite syntax."""
 
+    __slots__ = (
+        "_column_list",
+        "_distinct",
+        "_from_statement",
+        "_where",
+        "_group_by",
+        "_having",
+        "_clauses",
+        "_head",
+    )
+
     def __init__(
         self,
         column_list: list[str] = None,
@@ -252,65 +469,105 @@ class Select(TableValuedQuery):
         parent: SQLExecutable = None,
     ):
         super().__init__(parent)
-        self._column_list = [] if column_list is None else column_list
-        self._distinct = distinct
+        # copied, the head is rendered once from the list
+        self._column_list = [] if column_list is None else list(column_list)
+        self._distinct = bool(distinct)
         self._from_statement: TableValuedQuery = None
         self._where: Where = None
         self._group_by: GroupBy = None
         self._having: Having = None
+        self._clauses = 0
+        self._set_head()
 
     def sql(self) -> str:
-        """Get a string representation of the current SQL statement."""
+        """Get a string representation of the current SQL statement.
+        Not cached if the FROM clause holds a table valued query,
+        which may still change after it was added."""
+        from_statement = self._from_statement
+        if from_statement is not None and from_statement.has_subquery():
+            return self._render()
+        return super().sql()
+
+    def _set_head(self):
+        "Render the keyword and column list, which only change on their mutators."
+        self._head = _SELECT_KEYWORD[self._distinct] + (
+            ", ".join(self._column_list) if self._column_list else "*"
+        )
+        self._rendered = None
+
+    def _render(self) -> str:
+        """Render the current SQL statement as a string."""
         if self._from_statement is None:
             raise InvalidSQLStatementException(
                 "SELECT statement must have a FROM clause."
             )
-        sql = f"SELECT {'DISTINCT ' if self._distinct else ''}{', '.join(self._column_list)}"
-        if self._column_list is None or len(self._column_list) == 0:
-            sql += "*"
-        sql += self._from_statement.sql()
-        if self._where is not None:
-            sql += self._where.sql()
-        if self._group_by is not None:
-            sql += self._group_by.sql()
-        if self._having is not None:
-            sql += self._having.sql()
-        return sql
+        clauses = self._clauses
+        if not clauses:
+            # most statements have no optional clauses
+            return self._head + self._from_statement.sql()
+        optional = _SELECT_CLAUSES[clauses](self)
+        return f"{self._head}{self._from_statement.sql()}{optional}"
 
     def distinct(self):
         """Sets the distinct flag for the select statement.
         If not called select will not be distinct."""
         self._distinct = True
+        self._set_head()
         return self
 
     def all(self):
         """Removes the distinct flag for the select statement."""
         self._distinct = False
+        self._set_head()
         return self
 
     def columns(self, column_list: list[str]):
         """Sets the columns for the select statement.
         Default is ['*']. Any existing list is discarded."""
-        self._column_list = column_list
+        self._column_list = list(column_list)
+        self._set_head()
         return self
 
     def from_(self, table: str | TableValuedQuery):
         """Sets the from clause for the select statement.
         The statement will not execute without a from clause."""
-        from_table = self.sql_factory.get_sql_class(From)(table)
+        from_table = self.get_sql_class(From)(table)
+        from_table._owner = self
         self._from_statement = from_table
+        self._rendered = None
         return self
 
     def where(self, condition: SQLExpression):
         """Sets the where clause for the select statement. Optional."""
-        where = self.sql_factory.get_sql_class(Where)(condition)
+        where = self.get_sql_class(Where)(condition)
         self._where = where
+        self._clauses |= _SELECT_WHERE
+        self._rendered = None
+        return self
+
+    def group_by(self, column_list: list[str]):
+        """Sets the group by clause for the select statement. Optional."""
+        group_by = self.get_sql_class(GroupBy)(column_list)
+        group_by._owner = self
+        self._group_by = group_by
+        self._clauses |= _SELECT_GROUP_BY
+        self._rendered = None
+        return self
+
+    def group_by_column(self, column: str):
+        """Add a column to the group by clause of the select statement.
+        The clause is set if it is not yet."""
+        if self._group_by is None:
+            return self.group_by([column])
+        self._group_by.add_column(column)
         return self
 
     def having(self, condition: SQLExpression):
         """Sets the having clause for the select statement. Optional."""
-        having = self.sql_factory.get_sql_class(Having)(condition)
+        having = self.get_sql_class(Having)(condition)
         self._having = having
+        self._clauses |= _SELECT_HAVING
+        self._rendered = None
         return self
 
 
@@ -322,6 +579,17 @@ class Insert(SQLStatement):
     Default implementation complies with SQLite syntax.
     """
 
+    __slots__ = (
+        "_table",
+        "_values",
+        "_return_str",
+        "_batch",
+        "_bound",
+    )
+
+    # %-format template filled with the table, column names, values and RETURNING clause
+    sql_template = "INSERT INTO %s %s %s%s"
+
     def __init__(
         self,
         table: str,
@@ -333,32 +601,39 @@ class Insert(SQLStatement):
         super().__init__(parent)
         self._table = table
         self._values = self.get_sql_class(Values)([])
+        self._values._owner = self
         self._return_str: str = ""
+        self._batch: BatchValues = None
+        self._bound = False
         if rows is not None:
             self.rows(rows=rows)
 
-    def sql(self) -> str:
-        """Get a string representation of the current SQL statement."""
-        sql = f"INSERT INTO {self._table} {self._values.names()} {self._values.sql()}"
-        LOG.debug(f"Insert.sql() -> {sql + self._return_str}")
-        return sql + self._return_str
+    def _render(self) -> str:
+        """Render the current SQL statement as a string."""
+        values = self._values
+        if self._batch is not None:
+            if values.rows:
+                raise InvalidSQLStatementException(
+                    "INSERT statement must not combine rows and a rows batch."
+                )
+            values = self._batch
+        return self.sql_template % (
+            self._table,
+            values.names(),
+            values.sql(),
+            self._return_str,
+        )
 
     def _single_row(self, cols: list[tuple[str, any] | Value]):
         """Add a single row of values to be inserted"""
-        LOG.debug(f"Insert.single_row({cols=})")
+        value = self.get_sql_class(Value)
         row = self.get_sql_class(Row)(
             [
-                (
-                    col
-                    if isinstance(col, Value)
-                    else self.get_sql_class(Value)(name=col[0], value=col[1])
-                )
+                (col if isinstance(col, Value) else value(name=col[0], value=col[1]))
                 for col in cols
             ]
         )
-        LOG.debug(f"{row.sql()=}")
         self._values.row(row)
-        LOG.debug(f"{self.sql()=}")
         return self
 
     def rows(
@@ -369,9 +644,49 @@ class Insert(SQLStatement):
             self._single_row(row)
         return self
 
+    def rows_batch(self, columns: list[str], rows: list[tuple]):
+        """Insert many rows through a single statement with a placeholder per column.
+        The statement is executed once per row by the driver (executemany)
+        instead of rendering all values into the SQL."""
+        self._batch = self.get_sql_class(BatchValues)(columns, rows)
+        self._bound = False
+        self._rendered = None
+        return self
+
+    def columns_batch(self, columns: dict[str, list]):
+        """Insert many rows given column-major as one list of values per column.
+        Executed like a rows batch."""
+        self._batch = self.get_sql_class(ColumnarValues)(columns)
+        self._bound = False
+        self._rendered = None
+        return self
+
+    def bound_row(self, cols: list[tuple[str, any]]):
+        """Insert a single row with its values bound as parameters.
+        Renders a placeholder per column without building a Row of Values."""
+        self._batch = self.get_sql_class(BatchValues)(
+            [col[0] for col in cols], [tuple([col[1] for col in cols])]
+        )
+        self._bound = True
+        self._rendered = None
+        return self
+
+    def batch_params(self):
+        """Parameter sets of the rows batch, None if no rows batch is set."""
+        if self._batch is None or self._bound:
+            return None
+        return self._batch.params()
+
+    def bound_params(self):
+        """Parameters of the bound row, None if no row is bound."""
+        if self._bound:
+            return self._batch.params()[0]
+        return None
+
     def returning(self, column: str):
         """Set the column to be returned after the insert statement is executed."""
-        self._return_str = f" RETURNING {column}"
+        self._return_str = _RETURNING + column
+        self._rendered = None
         return self
 
 
@@ -379,11 +694,23 @@ class Update(SQLStatement):
     """A SQLStatement representing an UPDATE statement.
     Default implementation complies with SQLite syntax."""
 
+    __slots__ = ("_table", "_where", "_return_str", "_assignments")
+
+    # %-format template filled with the table, assignments, WHERE and RETURNING clause
+    sql_template = "UPDATE %s SET %s%s%s"
+
     def __init__(self, table: str, parent: SQLExecutable = None):
         super().__init__(parent)
         self._table = table
         self._where: Where = None
-        self.assignments: List[Assignment] = []
+        self._return_str: str = ""
+        # add assignments by calling assignment(), which resets the cached SQL
+        self._assignments: List[Assignment] = []
+
+    @property
+    def assignments(self) -> tuple[Assignment, ...]:
+        "Assignments made by the update statement"
+        return tuple(self._assignments)
 
     def assignment(self, columns: list[str] | str, value: Value):
         """Add an assignment to the list of assignments to be made in the update statement.
@@ -393,25 +720,30 @@ class Update(SQLStatement):
                 A list of column names to be assigned the value.
             value (Value):
                 The value to be assigned to the column(s)."""
-        self.assignments.append(
-            self.sql_factory.get_sql_class(Assignment)(columns, value)
-        )
+        assignment = self.get_sql_class(Assignment)(columns, value)
+        assignment._owner = self
+        self._assignments.append(assignment)
+        self._rendered = None
         return self
 
     def where(self, condition: SQLExpression):
         """Set the where clause for the update statement."""
-        where: Where = self.sql_factory.get_sql_class(Where)(condition)
+        where: Where = self.get_sql_class(Where)(condition)
         self._where = where
+        self._rendered = None
         return self
 
     def returning(self, column: str):
         """Set the column to be returned after the update statement is executed."""
-        self.sql += f" RETURNING {column}"
+        self._return_str = _RETURNING + column
+        self._rendered = None
         return self
 
-    def sql(self) -> str:
-        """Get a string representation of the current SQL statement."""
-        sql = f"""UPDATE {self._table}
-            SET {', '.join([assignment.sql() for assignment in self.assignments])}"""
-
-        return sql
+    def _render(self) -> str:
+        """Render the current SQL statement as a string."""
+        return self.sql_template % (
+            self._table,
+            ", ".join([assignment.sql() for assignment in self._assignments]),
+            "" if self._where is None else self._where.sql(),
+            self._return_str,
+        )
@@ -1,117 +1,344 @@
 """Classes for building SQL expressions that can be used in SQLStatements."""
 
-from enum import Enum
+import functools
+import sys
+import weakref
 from typing import List
 
 from core.app_logging import getLogger
 
 LOG = getLogger(__name__)
 
+# Rendering conventions of the sql() methods:
+# two parts (a constant prefix and one rendered part) are joined with '+',
+# which avoids the formatting step of an f-string;
+# three or more parts use an f-string, which is faster than chained '+'.
+# Lists of rendered parts are built with list comprehensions: str.join
+# materializes a generator into a list anyway, so a generator only adds overhead.
 
-class JoinOperator(Enum):
-    """Enum for SQL join operators."""
+# bound join of comma separated lists, e.g. values of a row
+_comma_join = ", ".join
 
-    INNER = "INNER JOIN"
-    LEFT = "LEFT JOIN"
-    RIGHT = "RIGHT JOIN"
-    FULL = "FULL OUTER JOIN"
+# keywords of the clauses, interned so every rendered clause shares one object
+_FROM = sys.intern(" FROM ")
+_WHERE = sys.intern(" WHERE ")
+_GROUP_BY = sys.intern(" GROUP BY ")
+_HAVING = sys.intern(" HAVING ")
+_VALUES = sys.intern("VALUES ")
+
+
+# verbatim expressions shared by SQLExpression.intern(), keyed by class and text
+_interned = weakref.WeakValueDictionary()
+
+
+class JoinOperator:
+    """SQL join operators as ready to use SQL fragments, interned like the keywords."""
+
+    INNER = sys.intern(" INNER JOIN ")
+    LEFT = sys.intern(" LEFT JOIN ")
+    RIGHT = sys.intern(" RIGHT JOIN ")
+    FULL = sys.intern(" FULL OUTER JOIN ")
 
 
 class SQLExpression:
     """Base class for an SQL expression.
     Can be instantiated directly to create an expression verbatim from a string."""
 
+    __slots__ = ("_expression", "_rendered", "__weakref__")
+
     def __init__(self, expression: str):
         self._expression = "Null" if expression is None else expression
+        self._rendered = None
+
+    @classmethod
+    def intern(cls, expression: str) -> "SQLExpression":
+        """Return a shared instance for the verbatim expression.
+        The instance lives as long as it is referenced by any expression tree."""
+        key = (cls, expression)
+        interned = _interned.get(key)
+        if interned is None:
+            interned = _interned[key] = cls(expression)
+        return interned
 
     def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        return self._expression
+        """Return the SQL expression as a string.
+        The expression is rendered on the first call and cached."""
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = self._render()
+        return rendered
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string.
+        Numeric literals are kept as numbers in the expression (see In.from_eq_chain)."""
+        return str(self._expression)
+
+    def _write(self, parts: list[str]) -> None:
+        """Append the rendered SQL expression to a list of string parts.
+        Containers of many expressions override this to append their parts
+        directly instead of building an intermediate string."""
+        parts.append(self.sql())
+
+    def _children(self) -> tuple["SQLExpression", ...]:
+        """Sub-expressions combined by this expression, empty for a leaf.
+        Expressions with children are rendered by _render_tree and implement _combine."""
+        return ()
+
+    def _combine(self, rendered: list[str]) -> str:
+        """Render the expression from the rendered children."""
+        raise NotImplementedError(
+            f"{self.__class__.__name__} has no children to combine."
+        )
+
+
+def _invalidate(node) -> None:
+    """Reset the cached SQL of an expression or statement and of all containing it.
+    Mutable expressions reference the expression or statement they were added to
+    as their '_owner'."""
+    while node is not None:
+        node._rendered = None
+        node = getattr(node, "_owner", None)
+
+
+def _render_tree(root: SQLExpression) -> str:
+    """Render an expression tree by an iterative post-order walk.
+    Avoids a Python frame per level and the recursion limit on deeply nested conditions.
+    Each rendered node is cached like SQLExpression.sql does."""
+    # render the children of the root directly as long as they are leaves or cached,
+    # which covers most expressions
+    children = root._children()
+    rendered = []
+    for child in children:
+        sql = child._rendered
+        if sql is None:
+            if child._children():
+                break
+            sql = child.sql()
+        rendered.append(sql)
+    else:
+        return root._combine(rendered)
+    # frames of the nodes being rendered: node, its children, their rendered SQL so far
+    stack = [(root, children, rendered)]
+    while True:
+        node, children, rendered = stack[-1]
+        if len(rendered) < len(children):
+            child = children[len(rendered)]
+            sql = child._rendered
+            if sql is None:
+                grandchildren = child._children()
+                if grandchildren:
+                    stack.append((child, grandchildren, []))
+                    continue
+                sql = child.sql()
+            rendered.append(sql)
+            continue
+        sql = node._rendered = node._combine(rendered)
+        stack.pop()
+        if not stack:
+            return sql
+        stack[-1][2].append(sql)
+
+
+# numeric operand types wrapped verbatim, dispatched on the exact type
+_LITERAL_TYPES = frozenset((int, float))
+
+
+def _as_expression(operand: SQLExpression | str) -> SQLExpression:
+    """Return the operand as an SQLExpression, wrapping it verbatim if necessary.
+    Plain strings are the common case and are checked first, then verbatim
+    expressions by identity before the isinstance() check of other classes."""
+    cls = operand.__class__
+    if cls is str:
+        return SQLExpression.intern(operand)
+    if cls is SQLExpression:
+        return operand
+    if cls in _LITERAL_TYPES:
+        # numbers are not interned: 1 and 1.0 would share a key
+        return SQLExpression(operand)
+    if isinstance(operand, SQLExpression):
+        return operand
+    return SQLExpression(operand)
+
+
+def _table_sql(table) -> str:
+    "Render a table name, or a table valued query as a parenthesized subquery."
+    return table if table.__class__ is str else f"({table.sql()})"
+
+
+def _check_table(table) -> None:
+    "Raise ValueError unless 'table' is a table name or a table valued query"
+    if table.__class__ is not str and not hasattr(table, "sql"):
+        raise ValueError(f"{table!r} is neither a table nor a table valued query")
 
 
 class From(SQLExpression):
-    """Class for the FROM clause of an SQL statement."""
+    """Class for the FROM clause of an SQL statement.
+    A clause selecting from a table valued query is not cached,
+    as the query may still change after it was added."""
+
+    __slots__ = ("table", "joins", "_join_heads", "_subquery", "_owner")
 
     def __init__(self, table):
         super().__init__(None)
+        _check_table(table)
         self.table = table
-        self.joins: List[(JoinOperator, str, SQLExpression)] = []
+        # statement selecting from the clause, its cached SQL is reset on a join
+        self._owner = None
+        # joins as the join operator, the joined table and the join constraint
+        self.joins: List[(str, str, SQLExpression)] = []
+        # constant fragment "operator table ON " of each join rendered when it is
+        # added, None for a joined table valued query which may still change
+        self._join_heads: List[str | None] = []
+        self._subquery = table.__class__ is not str
+
+    def has_subquery(self) -> bool:
+        "True if the clause selects from or joins a table valued query"
+        return self._subquery
 
     def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        sql = f" FROM {self.table}"
-        if len(self.joins) > 0:
-            sql += " ".join(
-                [f"{join[0]} {join[1]} ON {join[2].sql()}" for join in self.joins]
-            )
-        return sql
+        """Return the SQL expression as a string.
+        Cached unless the clause holds a table valued query."""
+        if self._subquery:
+            return self._render()
+        return super().sql()
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        if not self.joins:
+            return _FROM + _table_sql(self.table)
+        parts = [_FROM, _table_sql(self.table)]
+        for head, (join_operator, table, constraint) in zip(
+            self._join_heads, self.joins
+        ):
+            if head is None:
+                head = f"{join_operator}{_table_sql(table)} ON "
+            parts.append(head)
+            constraint._write(parts)
+        return "".join(parts)
 
     def join(
         self,
-        table=None,
+        table,
         join_constraint: "SQLExpression" = None,
-        join_operator: JoinOperator = JoinOperator.FULL,
+        join_operator: str = JoinOperator.FULL,
     ):
-        """Add a join to another table to the FROM clause."""
+        """Add a join to another table to the FROM clause.
+        'table' is a table name or a table valued query."""
+        _check_table(table)
         self.joins.append((join_operator, table, join_constraint))
+        _invalidate(self._owner)
+        if table.__class__ is not str:
+            self._join_heads.append(None)
+            self._subquery = True
+            self._rendered = None
+            return
+        head = f"{join_operator}{table} ON "
+        self._join_heads.append(head)
+        if self._rendered is not None:
+            # extend the rendered clause instead of rendering all joins again
+            self._rendered = f"{self._rendered}{head}{join_constraint.sql()}"
+
+
+def _combine_operator(self, rendered: list[str]) -> str:
+    """Join the rendered arguments of a concrete SQLMultiExpressin with its operator.
+    The arguments are stripped of their own padding to render single-spaced."""
+    return f" ({self.operator.join([sql.strip() for sql in rendered])}) "
+
+
+def _combine_template(self, rendered: list[str]) -> str:
+    "Fill the %-format template of a concrete binary or ternary expression."
+    return self._template % tuple(rendered)
 
 
 class SQLMultiExpressin(SQLExpression):
     """Abstract class to combine any number of SQL expressions with an operator.
     Should not be instantiated directly."""
 
+    __slots__ = ("arguments",)
+
     def __init__(self, arguments: List[SQLExpression]):
         super().__init__(None)
         self.arguments = arguments
 
     operator: str = None
 
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        if self.__class__.operator is None:
-            raise NotImplementedError(
-                "SQL_multi_expression is an abstract class and should not be instantiated."
-            )
-        return self.__class__.operator.join(
-            [expression.sql() for expression in self._expression]
+    def __init_subclass__(cls, **kwargs):
+        # subclasses defining an operator are concrete, checked once here
+        # instead of on every render
+        super().__init_subclass__(**kwargs)
+        if cls.operator is not None:
+            cls._combine = _combine_operator
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _render_tree(self)
+
+    def _children(self) -> tuple[SQLExpression, ...]:
+        return tuple(self.arguments)
+
+    def _combine(self, rendered: list[str]) -> str:
+        raise NotImplementedError(
+            "SQL_multi_expression is an abstract class and should not be instantiated."
         )
 
 
 class And(SQLMultiExpressin):
     """Represents a SQL AND expression."""
 
-    operator = " AND "
+    __slots__ = ()
+
+    operator = sys.intern(" AND ")
 
 
 class Or(SQLMultiExpressin):
     """Represents a SQL OR expression."""
 
-    operator = " OR "
+    __slots__ = ()
+
+    operator = sys.intern(" OR ")
 
 
 class SQLBinaryExpression(SQLExpression):
     """Abstract class to combine exactly two SQL expressions with an operator.
     Should not be instantiated directly."""
 
+    __slots__ = ("left", "right")
+
     def __init__(self, left: SQLExpression | str, right: SQLExpression | str):
         super().__init__(None)
-        self.left = left if isinstance(left, SQLExpression) else SQLExpression(left)
-        self.right = right if isinstance(right, SQLExpression) else SQLExpression(right)
+        self.left = _as_expression(left)
+        self.right = _as_expression(right)
 
     operator = None
-
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        if self.__class__.operator is None:
-            raise NotImplementedError(
-                "SQL_binary_expression is an abstract class and should not be instantiated."
-            )
-        return f" ({self.left.sql()} {self.__class__.operator} {self.right.sql()}) "
+    # %-format template of the expression, built from 'operator' per subclass
+    # e.g. " (%s = %s) "
+    _template = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.operator is not None:
+            operator = cls.operator.strip().replace("%", "%%")
+            cls._template = f" (%s {operator} %s) "
+            cls._combine = _combine_template
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _render_tree(self)
+
+    def _children(self) -> tuple[SQLExpression, ...]:
+        return (self.left, self.right)
+
+    def _combine(self, rendered: list[str]) -> str:
+        raise NotImplementedError(
+            "SQL_binary_expression is an abstract class and should not be instantiated."
+        )
 
 
 class Eq(SQLBinaryExpression):
     """Represents a SQL = expression."""
 
+    __slots__ = ()
+
     operator = " = "
 
 
@@ -119,6 +346,8 @@ class SQLTernaryExpression(SQLExpression):
     """Abstract class to combine exactly three SQL expressions with two operators.
     Should not be instantiated directly."""
 
+    __slots__ = ("first", "second", "third")
+
     def __init__(
         self,
         first: SQLExpression | str,
@@ -126,95 +355,273 @@ class SQLTernaryExpression(SQLExpression):
         third: SQLExpression | str,
     ):
         super().__init__(None)
-        self.first = first if isinstance(first, SQLExpression) else SQLExpression(first)
-        self.second = (
-            second if isinstance(second, SQLExpression) else SQLExpression(second)
-        )
-        self.third = third if isinstance(third, SQLExpression) else SQLExpression(third)
+        self.first = _as_expression(first)
+        self.second = _as_expression(second)
+        self.third = _as_expression(third)
 
     operator_one = None
     operator_two = None
-
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        if self.__class__.operator_one is None or self.__class__.operator_two is None:
-            raise NotImplementedError(
-                "SQL_binary_expression is an abstract class and should not be instantiated."
-            )
-        return f" ({self.first.sql()} {self.__class__.operator_one} {self.second.sql()} {self.__class__.operator_two} {self.third.sql()}) "
+    # %-format template of the expression, built from the operators per subclass
+    # e.g. " (%s BETWEEN %s AND %s) "
+    _template = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.operator_one is not None and cls.operator_two is not None:
+            operator_one = cls.operator_one.strip().replace("%", "%%")
+            operator_two = cls.operator_two.strip().replace("%", "%%")
+            cls._template = f" (%s {operator_one} %s {operator_two} %s) "
+            cls._combine = _combine_template
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _render_tree(self)
+
+    def _children(self) -> tuple[SQLExpression, ...]:
+        return (self.first, self.second, self.third)
+
+    def _combine(self, rendered: list[str]) -> str:
+        raise NotImplementedError(
+            "SQL_ternary_expression is an abstract class and should not be instantiated."
+        )
 
 
 class SQLBetween(SQLTernaryExpression):
     """Represents a SQL BETWEEN expression."""
 
+    __slots__ = ()
+
     operator_one = " BETWEEN "
     operator_two = " AND "
 
 
+def _literal(value: int | float | str) -> str:
+    "Render a number verbatim and a string quoted, with embedded quotes doubled"
+    if value.__class__ in _LITERAL_TYPES:
+        return str(value)
+    if value.__class__ is str:
+        return "'" + value.replace("'", "''") + "'"
+    raise TypeError(f"no SQL literal for {value!r}")
+
+
+class In(SQLExpression):
+    """Represents a SQL IN expression testing a column against a list of values.
+    Renders the list in a single join instead of an OR chain of Eq expressions.
+    Values are numbers or strings, rendered as SQL literals."""
+
+    __slots__ = ("column", "values")
+
+    def __init__(self, column: SQLExpression | str, values: list[int | float | str]):
+        super().__init__(None)
+        self.column = _as_expression(column)
+        self.values = values
+
+    @classmethod
+    def from_eq_chain(cls, conditions: list[SQLExpression]) -> "In | None":
+        """Return the IN expression equivalent to an OR chain of the conditions
+        if all of them compare the same column with a number, else None."""
+        column = None
+        values = []
+        for condition in conditions:
+            if not isinstance(condition, Eq):
+                return None
+            right = condition.right
+            if right.__class__ is not SQLExpression or (
+                right._expression.__class__ not in _LITERAL_TYPES
+            ):
+                return None
+            if column is None:
+                column = condition.left
+            elif condition.left.sql() != column.sql():
+                return None
+            values.append(right._expression)
+        if column is None:
+            return None
+        return cls(column, values)
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        values = _comma_join([_literal(value) for value in self.values])
+        return f" ({self.column.sql()} IN ({values})) "
+
+
 class Value(SQLExpression):
     """Represents a value in an SQL statement."""
 
+    __slots__ = ("_name", "_value")
+
     def __init__(self, name: str, value: any):
         # LOG.debug(f"Value({name=}, {value=})")
         super().__init__(None)
-        self._name = name
+        # names repeat across statements; interned they share one object
+        self._name = sys.intern(name) if name.__class__ is str else name
         self._value = value
 
     def name(self) -> str:
         "Name of the value"
         return self._name
 
-    def sql(self) -> str:
+    def _render(self) -> str:
         return str(self._value)
 
 
+class Placeholder(SQLExpression):
+    """Represents a named parameter bound when the statement is executed.
+    Default implementation renders the named style of sqlite3 (':name'),
+    dialects with another parameter style override 'template'."""
+
+    __slots__ = ("_name",)
+
+    # %-format template of the placeholder, filled with the parameter name
+    template = ":%s"
+
+    def __init__(self, name: str):
+        super().__init__(None)
+        self._name = name
+
+    def name(self) -> str:
+        "Name of the parameter"
+        return self._name
+
+    def _render(self) -> str:
+        return self.template % self._name
+
+
 class Row(SQLExpression):
     """Represents a list of values defining a row in an SQL statement such as an INSERT."""
 
+    __slots__ = ("values", "_value_sql", "_owner")
+
     def __init__(self, values: list[Value] = None):
         # LOG.debug(f"Row({values=})")
         super().__init__(None)
         self.values = [] if values is None else values
+        # Values holding the row, its cached SQL is reset when a value is added
+        self._owner = None
+        # rendered values kept in step with 'values', add values by calling value()
+        self._value_sql = [v.sql() for v in self.values]
 
     def value(self, value: Value):
         """Add a value to the end of the row."""
         self.values.append(value)
+        self._value_sql.append(value.sql())
+        _invalidate(self)
         return self
 
     def names(self) -> str:
         "List of value names"
-        return f"({', '.join([v.name() for v in self.values])})"
-
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        return f"({', '.join([v.sql() for v in self.values])})"
+        return f"({_comma_join([v.name() for v in self.values])})"
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return f"({_comma_join(self._value_sql)})"
+
+    def _write(self, parts: list[str]) -> None:
+        """Append the row to a list of string parts, without rendering the row
+        as a string of its own unless it is already cached."""
+        rendered = self._rendered
+        if rendered is None:
+            parts += ("(", _comma_join(self._value_sql), ")")
+        else:
+            parts.append(rendered)
 
 
 class Values(SQLExpression):
     """Represents a list of rows in an SQL statement such as an INSERT."""
 
+    __slots__ = ("rows", "_owner")
+
     def __init__(self, rows: list[Row]):
         # LOG.debug(f"Values({rows=})")
         super().__init__(None)
         self.rows = rows
+        for row in rows:
+            row._owner = self
+        # statement inserting the rows, its cached SQL is reset when a row changes
+        self._owner = None
 
     def row(self, value: Row):
         """Add a row to the end of the list."""
         self.rows.append(value)
+        value._owner = self
+        _invalidate(self._owner)
+        rendered = self._rendered
+        if rendered is not None:
+            # extend the rendered rows instead of rendering all of them again
+            if len(self.rows) > 1:
+                rendered += ", "
+            self._rendered = rendered + value.sql()
         return self
 
     def names(self) -> str:
         "List of value names"
         return self.rows[0].names()
 
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        return f"VALUES {', '.join([row.sql() for row in self.rows])}"
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        parts = [_VALUES]
+        for row in self.rows:
+            row._write(parts)
+            parts.append(", ")
+        if self.rows:
+            parts.pop()
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _placeholder_values(columns: tuple[str], template: str) -> str:
+    "VALUES clause with a named placeholder per column, shared by all batches of a table"
+    return f"{_VALUES}({_comma_join([template % column for column in columns])})"
+
+
+class BatchValues(SQLExpression):
+    """Represents the rows of a batch INSERT rendered as a single row of placeholders.
+    The rows are bound as one parameter set each when executed (executemany)."""
+
+    __slots__ = ("columns", "data")
+
+    # %-format template of the placeholders, as of Placeholder
+    template = Placeholder.template
+
+    def __init__(self, columns: list[str], data: list[tuple]):
+        super().__init__(None)
+        self.columns = columns
+        self.data = data
+
+    def names(self) -> str:
+        "List of column names"
+        return f"({_comma_join(self.columns)})"
+
+    def params(self) -> list[dict]:
+        "Parameter sets of the rows, keyed by column name"
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.data]
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _placeholder_values(tuple(self.columns), self.template)
+
+
+class ColumnarValues(BatchValues):
+    """Represents the rows of a batch INSERT stored column-major,
+    i.e. one list of values per column instead of one tuple per row."""
+
+    __slots__ = ()
+
+    def __init__(self, columns: dict[str, list]):
+        super().__init__(list(columns), list(columns.values()))
+
+    def params(self) -> list[dict]:
+        "Parameter sets of the rows, keyed by column name"
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in zip(*self.data)]
 
 
 class Assignment(SQLExpression):
     """Represents an assignment in an SQL statement such as an UPDATE."""
 
+    __slots__ = ("columns", "value", "_where", "_owner")
+
     def __init__(
         self,
         columns: list[str] | str,
@@ -223,61 +630,109 @@ class Assignment(SQLExpression):
         super().__init__(None)
         self.columns = [columns] if isinstance(columns, str) else columns
         self.value = value
-        self.where: Where = None
-
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        sql = Eq(",".join(self.columns), self.value.sql())
-        if self.where is not None:
-            sql += self.where.sql()
+        self._where: Where = None
+        # statement making the assignment, its cached SQL is reset with the WHERE clause
+        self._owner = None
+
+    @property
+    def where(self) -> "Where":
+        "Optional WHERE clause of the assignment"
+        return self._where
+
+    @where.setter
+    def where(self, where: "Where"):
+        self._where = where
+        _invalidate(self)
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        sql = f"{_comma_join(self.columns)} = {self.value.sql()}"
+        if self._where is not None:
+            return sql + self._where.sql()
         return sql
 
 
 class Where(SQLExpression):
     """Represents a WHERE clause in an SQL statement."""
 
+    __slots__ = ("condition",)
+
     def __init__(self, condition: SQLExpression):
         super().__init__(None)
         self.condition = condition
 
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        return f" WHERE {self.condition.sql()}"
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _render_tree(self)
+
+    def _children(self) -> tuple[SQLExpression, ...]:
+        return (self.condition,)
+
+    def _combine(self, rendered: list[str]) -> str:
+        return _WHERE + rendered[0]
 
 
 class GroupBy(SQLExpression):
     """Represents a GROUP BY clause in an SQL statement."""
 
+    __slots__ = ("column_list", "_owner")
+
     def __init__(self, column_list: list[str]):
         super().__init__(None)
-        self.column_list = column_list
-
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        return f"GROUP BY {', '.join(self.column_list)}"
+        # copied, add_column() must not extend the caller's list
+        self.column_list = list(column_list)
+        # statement grouping by the clause, its cached SQL is reset when a column is added
+        self._owner = None
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _GROUP_BY + _comma_join(self.column_list)
+
+    def add_column(self, column: str):
+        """Add a column to the end of the column list.
+        An already rendered clause is extended instead of rendered again."""
+        self.column_list.append(column)
+        _invalidate(self._owner)
+        if self._rendered is not None:
+            self._rendered = (
+                self._rendered + ", " + column
+                if len(self.column_list) > 1
+                else self._rendered + column
+            )
+        return self
 
 
 class Having(SQLExpression):
     """Represents a HAVING clause in an SQL statement."""
 
+    __slots__ = ("condition",)
+
     def __init__(self, condition: SQLExpression):
         super().__init__(None)
         self.condition = condition
 
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
-        return f" HAVING {self.condition.sql()}"
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _render_tree(self)
+
+    def _children(self) -> tuple[SQLExpression, ...]:
+        return (self.condition,)
+
+    def _combine(self, rendered: list[str]) -> str:
+        return _HAVING + rendered[0]
 
 
 class SQLColumnDefinition(SQLExpression):
     """Represents the definition of a column in an SQL table."""
 
+    __slots__ = ("name", "data_type", "constraint")
+
     type_map = {}
     constraint_map = {}
 
     def __init__(self, name: str, data_type: type, constraint: str = None):
         super().__init__(None)
-        self.name = name
+        self.name = sys.intern(name)
         if data_type in self.type_map:
             self.data_type = self.__class__.type_map[data_type]
         else:
@@ -293,6 +748,6 @@ class SQLColumnDefinition(SQLExpression):
                 f"Unsupported column constraint for a {self.__class__.__name__}: {constraint}"
             )
 
-    def sql(self) -> str:
-        """Return the SQL expression as a string."""
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
         return f"{self.name} {self.data_type} {self.constraint}"
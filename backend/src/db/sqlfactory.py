@@ -1,7 +1,82 @@
+from db.sqlexpression import SQLExpression, And, Or, In
+
+# constant conditions recognized when combining conditions with SQLFactory.and_/or_
+TRUE = SQLExpression("1=1")
+FALSE = SQLExpression("0=1")
+
 
 class SQLFactory():
 
+    # classes of the dialect resolved by get_sql_class, one dict per factory class
+    _resolved: dict[type, type] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._resolved = {}
+
     @classmethod
     def get_sql_class(cls, sql_cls: type):
         "Return a class for the SQL dialect. Implementations for specific SQL dialects should override this method."
-        return sql_cls
\ No newline at end of file
+        return sql_cls
+
+    @classmethod
+    def resolve(cls, sql_cls: type):
+        "Return the class for the SQL dialect as get_sql_class does, resolving each class only once."
+        try:
+            return cls._resolved[sql_cls]
+        except KeyError:
+            dialect_cls = cls._resolved[sql_cls] = cls.get_sql_class(sql_cls)
+            return dialect_cls
+
+    @classmethod
+    def and_(cls, *conditions: SQLExpression | str) -> SQLExpression:
+        "Combine conditions with AND, simplified while building (see _combine)."
+        return cls._combine(And, conditions, neutral=TRUE, absorbing=FALSE)
+
+    @classmethod
+    def or_(cls, *conditions: SQLExpression | str) -> SQLExpression:
+        "Combine conditions with OR, simplified while building (see _combine)."
+        return cls._combine(Or, conditions, neutral=FALSE, absorbing=TRUE)
+
+    @classmethod
+    def _combine(
+        cls,
+        multi_cls: type,
+        conditions: tuple,
+        neutral: SQLExpression,
+        absorbing: SQLExpression,
+    ) -> SQLExpression:
+        """Combine conditions with the operator of 'multi_cls'.
+        Nested conditions of the same operator are flattened, neutral conditions
+        and duplicates dropped; an absorbing condition is returned right away.
+        A single remaining condition is returned without combining,
+        an OR chain comparing one column with numbers is returned as IN."""
+        neutral_sql = neutral.sql()
+        absorbing_sql = absorbing.sql()
+        arguments = []
+        seen = set()
+        for condition in conditions:
+            nested = (
+                condition.arguments
+                if isinstance(condition, multi_cls)
+                else (condition,)
+            )
+            for argument in nested:
+                if not isinstance(argument, SQLExpression):
+                    argument = SQLExpression(argument)
+                sql = argument.sql()
+                if sql == absorbing_sql:
+                    return absorbing
+                if sql == neutral_sql or sql in seen:
+                    continue
+                seen.add(sql)
+                arguments.append(argument)
+        if not arguments:
+            return neutral
+        if len(arguments) == 1:
+            return arguments[0]
+        if multi_cls is Or:
+            in_list = cls.resolve(In).from_eq_chain(arguments)
+            if in_list is not None:
+                return in_list
+        return cls.resolve(multi_cls)(arguments)
@@ -1,14 +1,18 @@
 """ Connection to SQLit DB using aiosqlite """
 
+import collections
+import collections.abc
 import datetime
+import functools
 
 from core.exceptions import OperationalError
 from core.config import Config
 from core.app_logging import getLogger
 from db.db_base import DB, Connection, Cursor
 from db.sqlexecutable import SQL, SQLExecutable, SQLTemplate, SQLScript
-from db.sqlexpression import SQLColumnDefinition
+from db.sqlexpression import SQLColumnDefinition, BatchValues, ColumnarValues
 from db.sqlfactory import SQLFactory
+from db.sql import SQL as SQLSnippet
 
 LOG = getLogger(__name__)
 try:
@@ -25,23 +29,91 @@ class SQLiteSQLFactory(SQLFactory):
     @classmethod
     def get_sql_class(cls, sql_cls: type):
         # LOG.debug(f"SQLiteSQLFactory.get_sql_class({sql_cls=})")
-        for sqlite_class in [SQLiteColumnDefinition, SQLiteScript]:
+        for sqlite_class in [
+            SQLiteColumnDefinition,
+            SQLiteScript,
+            SQLiteBatchValues,
+            SQLiteColumnarValues,
+        ]:
             if sql_cls.__name__ in [b.__name__ for b in sqlite_class.__bases__]:
                 return sqlite_class
         return super().get_sql_class(sql_cls)
 
 
+# column constraints, shared by SQLiteColumnDefinition and the column snippet
+_COLUMN_CONSTRAINTS = {
+    "pk": "PRIMARY KEY",
+    "pkinc": "PRIMARY KEY AUTOINCREMENT",
+    "dt": "DEFAULT CURRENT_TIMESTAMP",
+}
+# column types of the CREATE_TABLE_COLUMN snippet
+_COLUMN_TYPES = {
+    int: "INTEGER",
+    float: "REAL",
+    str: "TEXT",
+    datetime.datetime: "DATETIME",
+    datetime.date: "DATE",
+}
+
+
+def _create_table_column(column: tuple) -> str:
+    "definition of a column given as (name, type[, constraint]) for CREATE TABLE"
+    col_def = [column[0]]
+    col_type = _COLUMN_TYPES.get(column[1])
+    if col_type is not None:
+        col_def.append(col_type)
+    if len(column) > 2:
+        constraint = _COLUMN_CONSTRAINTS.get(column[2])
+        if constraint is not None:
+            col_def.append(constraint)
+    return " ".join(col_def)
+
+
 class SQLiteColumnDefinition(SQLColumnDefinition):
+    __slots__ = ()
 
     type_map = {int: "INTEGER", float: "REAL", str: "TEXT", datetime.datetime: "TEXT"}
-    constraint_map = {
-        "pk": "PRIMARY KEY",
-        "pkinc": "PRIMARY KEY AUTOINCREMENT",
-        "dt": "DEFAULT CURRENT_TIMESTAMP",
-    }
+    constraint_map = _COLUMN_CONSTRAINTS
+
+
+@functools.lru_cache(maxsize=128)
+def _positional_values(count: int) -> str:
+    "VALUES clause with a positional placeholder per column"
+    return f"VALUES ({', '.join(['?'] * count)})"
+
+
+class SQLiteBatchValues(BatchValues):
+    """Rows of a batch INSERT bound positionally ('?'),
+    sqlite3 binds the row tuples as they are, without a dict per row."""
+
+    __slots__ = ()
+
+    def params(self) -> list[tuple]:
+        "Parameter sets of the rows in column order"
+        return self.data
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _positional_values(len(self.columns))
+
+
+class SQLiteColumnarValues(ColumnarValues):
+    """Column-major rows of a batch INSERT bound positionally ('?')."""
+
+    __slots__ = ()
+
+    def params(self) -> list[tuple]:
+        "Parameter sets of the rows in column order"
+        return list(zip(*self.data))
+
+    def _render(self) -> str:
+        """Render the SQL expression as a string."""
+        return _positional_values(len(self.columns))
 
 
 class SQLiteScript(SQLScript):
+    __slots__ = ()
+
     sql_templates = {
         # SQL statement returning a result set with info on DB table 'table' with the following columns:
         # column_name:    name of table column
@@ -73,6 +145,14 @@ class SQLiteScript(SQLScript):
 
 
 class SQLiteDB(DB):
+    pool_min_size = 1
+    pool_max_size = 4
+    pool_max_idle = 4
+
+    _sql_dispatch = {
+        SQLSnippet.CREATE_TABLE_COLUMN: lambda db, column: _create_table_column(column)
+    }
+
     def __init__(self, **cfg) -> None:
         if AIOSQLITE_IMPORT_ERROR:
             raise ModuleNotFoundError(f"Import error: {AIOSQLITE_IMPORT_ERROR}")
@@ -88,47 +168,131 @@ class SQLiteDB(DB):
 
 
 class SQLiteConnection(Connection):
+    # settings applied once per connection, they persist while it is pooled
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    # sqlite3 keeps the prepared statements of a connection in an LRU cache
+    # keyed by the SQL text; statements bind their parameters, so the texts
+    # repeat and stay prepared while the connection is pooled
+    cached_statements = 512
+
     async def connect(self):
+        # field index of the last result set, sqlite3 keeps the same description
+        # object for all rows of a statement
+        last_fields = [None, {}]
+
         def row_factory(cursor, row):
-            fields = [column[0] for column in cursor.description]
-            return {key: value for key, value in zip(fields, row)}
+            description = cursor.description
+            if description is not last_fields[0]:
+                last_fields[0] = description
+                last_fields[1] = {column[0]: i for i, column in enumerate(description)}
+            return SQLiteRow(last_fields[1], row)
 
         self._connection = await aiosqlite.connect(
-            database=self._cfg[Config.CONFIG_DB_FILE]
+            database=self._cfg[Config.CONFIG_DB_FILE],
+            cached_statements=self.__class__.cached_statements,
         )
         self._connection.row_factory = row_factory
+        for pragma in self.__class__.pragmas:
+            await self._connection.execute(pragma)
         return self
 
-    async def execute(self, query: str, params=None, close=False, commit=False):
+    async def execute(self, query: str, params=None, commit=False):
         "execute an SQL statement and return a cursor"
         if commit:
             self._commit = commit
         cur = SQLiteCursor(cur=await self._connection.cursor(), con=self)
-        await cur.execute(query, params=params, close=close)
+        await cur.execute(query, params=params)
         return cur
 
+    async def executemany(self, query: str, params_seq, commit=False):
+        "execute an SQL statement for each set of parameters, return the number of affected rows"
+        if commit:
+            self._commit = commit
+        try:
+            cur = await self._connection.executemany(query, params_seq)
+        except sqlite3.OperationalError as err:
+            raise OperationalError(err)
+        rowcount = cur.rowcount
+        await cur.close()
+        return rowcount
+
+
+class SQLiteRow(collections.abc.Mapping):
+    """Result row read like a dict, its values are kept in the row tuple of sqlite3.
+    All rows of a result set share one index of the field names."""
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: dict[str, int], values: tuple):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
 
 class SQLiteCursor(Cursor):
+    __slots__ = ()
 
-    async def execute(self, query: str, params=None, close=False):
-        self._last_query = query
-        self._close = close
+    async def execute(self, query: str, params=None):
         try:
-            # LOG.debug(f"Executing: {query=}, {params=}, {close=}")
+            # LOG.debug(f"Executing: {query=}, {params=}")
             await self._cursor.execute(query, params)
             self._rowcount = self._cursor.rowcount
-        except sqlite3.OperationalError as err:
-            raise OperationalError(err)
-        if close is 0:
-            await self._connection.close()
-            return None
+        except Exception as err:
+            await self.close()
+            if isinstance(err, sqlite3.OperationalError):
+                raise OperationalError(err)
+            raise
         return self
 
     @property
     async def rowcount(self):
+        """Number of rows changed by a DML statement as reported by sqlite3.
+        sqlite3 reports -1 for queries, their rows are then fetched and counted
+        once, the fetched rows are served by the fetch methods afterwards.
+        Read it before fetching rows to get the size of the whole result set."""
         if self._rowcount == -1:
-            async with self._connection._connection.execute(
-                f"SELECT COUNT(*) AS rowcount FROM ({self._last_query})"
-            ) as sub_cur:
-                self._rowcount = (await sub_cur.fetchone())["rowcount"]
+            rows = await self._cursor.fetchall()
+            self._cursor = _FetchedRows(self._cursor, rows)
+            self._rowcount = len(rows)
         return self._rowcount
+
+
+class _FetchedRows:
+    "Stand-in for an aiosqlite cursor serving rows already fetched from it"
+
+    __slots__ = ("_cursor", "_rows")
+
+    def __init__(self, cursor, rows: list):
+        self._cursor = cursor
+        self._rows = collections.deque(rows)
+
+    async def fetchone(self):
+        return self._rows.popleft() if self._rows else None
+
+    async def fetchmany(self, size: int) -> list:
+        rows = self._rows
+        return [rows.popleft() for _ in range(min(size, len(rows)))]
+
+    async def fetchall(self) -> list:
+        rows = list(self._rows)
+        self._rows.clear()
+        return rows
+
+    async def close(self):
+        await self._cursor.close()
@@ -3,6 +3,7 @@
 """
 
 from enum import StrEnum
+import functools
 import logging
 from messages.message import Message, MessageType, MessageAttribute
 from core.app_logging import getLogger
@@ -27,6 +28,12 @@ LOGGING_LEVEL = {
 }
 
 
+@functools.lru_cache(maxsize=256)
+def _frontend_logger(caller: str) -> logging.Logger:
+    "logger for the messages of a frontend caller, looked up once per caller"
+    return getLogger(caller or "FrontEnd")
+
+
 class LogMessage(Message):
     "receive a log message and send to logger"
 
@@ -39,4 +46,4 @@ class LogMessage(Message):
         level = self.message.get(MessageAttribute.WS_ATTR_LOGLEVEL)
         text = self.message.get(MessageAttribute.WS_ATTR_MESSAGE)
         caller = self.message.get(MessageAttribute.WS_ATTR_CALLER)
-        getLogger(caller or "FrontEnd").log(LOGGING_LEVEL.get(level), text)
+        _frontend_logger(caller).log(LOGGING_LEVEL.get(level, logging.NOTSET), text)
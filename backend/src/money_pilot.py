@@ -4,7 +4,7 @@ import asyncio
 
 from core.exceptions import DBRestart
 from core.app import App
-from db.db import get_db
+from db.db import get_db, preload_driver
 from server.ws_server import get_websocket
 from core.app_logging import getLogger
 
@@ -32,6 +32,7 @@ LOG.debug(f"{__name__} (main) module initialized")
 if __name__ == "__main__":
     try:
         App.initialize()
+        preload_driver()
         asyncio.run(main())
     except KeyboardInterrupt:
         LOG.info("Stopped by KeyboardInterrupt")
@@ -32,6 +32,7 @@ class PersistantAttr:
         if not owner._attributes.get(owner.__name__):
             owner._attributes[owner.__name__] = []
         owner._attributes[owner.__name__].append(cols)
+        owner.attributes_changed()
 
     def __get__(self, obj, objtype=None):
         return obj._data.get(self.my_name)
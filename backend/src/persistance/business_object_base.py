@@ -8,7 +8,7 @@ from datetime import date, datetime, UTC
 from persistance.bo_descriptors import BOInt, BODatetime
 from core.app import App
 from db.sqlexecutable import SQL, CreateTable
-from db.sqlexpression import Eq, SQLExpression, Value
+from db.sqlexpression import Eq, Placeholder, SQLExpression
 from core.app_logging import getLogger
 
 LOG = getLogger(__name__)
@@ -41,15 +41,34 @@ class BOBase:
     def table(cls):
         return cls._table if cls._table else cls.__name__.lower() + "s"
 
+    @classmethod
+    def attributes_changed(cls):
+        """drop the cached attributes of the class and its subclasses,
+        called when an attribute is registered"""
+        for cache in ("_attribute_descriptions", "_attributes_dict"):
+            if cache in cls.__dict__:
+                delattr(cls, cache)
+        for subclass in cls.__subclasses__():
+            subclass.attributes_changed()
+
     @classmethod
     def attributes_as_dict(cls):
-        super_cols = {} if cls == BOBase else cls.__base__.attributes_as_dict()
-        return super_cols | {a[0]: a[1] for a in cls._attributes.get(cls.__name__, [])}
+        "types of the persistant attributes by name, computed once per class"
+        attributes = cls.__dict__.get("_attributes_dict")
+        if attributes is None:
+            attributes = {a[0]: a[1] for a in cls.attribute_descriptions()}
+            cls._attributes_dict = attributes
+        return attributes
 
     @classmethod
     def attribute_descriptions(cls):
-        super_cols = [] if cls == BOBase else cls.__base__.attribute_descriptions()
-        return super_cols + cls._attributes.get(cls.__name__, [])
+        "descriptions of the persistant attributes, computed once per class"
+        descriptions = cls.__dict__.get("_attribute_descriptions")
+        if descriptions is None:
+            super_cols = () if cls == BOBase else cls.__base__.attribute_descriptions()
+            descriptions = super_cols + tuple(cls._attributes.get(cls.__name__, []))
+            cls._attribute_descriptions = descriptions
+        return descriptions
 
     @classmethod
     async def sql_create_table(cls):
@@ -58,7 +77,7 @@ class BOBase:
         sql: CreateTable = SQL().create_table(cls.table)
         for attr in attributes:
             sql.column(attr[0], attr[1], attr[2])
-        await sql.execute(close=0)
+        await sql.execute()
 
     def convert_from_db(self, value, typ):
         "convert a value of type 'typ' read from the DB"
@@ -87,15 +106,25 @@ class BOBase:
         LOG.debug(f"fetching {self} with newest={newest}")
 
         sql = SQL().select([], True).from_(self.table)
+        params = None
         if self.id is not None:
-            sql.where(sql.get_sql_class(Eq)("id", id))
+            # bind the id as parameter so the DB can reuse the prepared statement
+            sql.where(
+                sql.get_sql_class(Eq)("id", sql.get_sql_class(Placeholder)("id"))
+            )
+            params = {"id": id}
         elif newest:
             sql.where(
                 sql.get_sql_class(SQLExpression)(
                     f"id = (SELECT MAX(id) FROM {self.table})"
                 )
             )
-        self._db_data = await (await sql.execute(close=1)).fetchone()
+        async with App.db.acquire() as con:
+            cur = await sql.execute(params, connection=con)
+            try:
+                self._db_data = await cur.fetchone()
+            finally:
+                await cur.close()
 
         if self._db_data:
             for attr, typ in [(a[0], a[1]) for a in self.attribute_descriptions()]:
@@ -117,35 +146,41 @@ class BOBase:
     async def _insert_self(self):
         assert self.id is None, "id must be None for insert operation"
 
-        self.id = (
-            await (
-                await (
-                    SQL()
-                    .insert(self.table)
-                    .rows(
-                        [
-                            (k, v)
-                            for k, v in self._data.items()
-                            if k != "id" and v is not None
-                        ]
-                    )
-                    .returning("id")
-                ).execute(close=1, commit=True)
-            ).fetchone()
-        ).get("id")
+        sql = (
+            SQL()
+            .insert(self.table)
+            .bound_row(
+                [(k, v) for k, v in self._data.items() if k != "id" and v is not None]
+            )
+            .returning("id")
+        )
+        async with App.db.acquire() as con:
+            cur = await sql.execute(commit=True, connection=con)
+            try:
+                self.id = (await cur.fetchone()).get("id")
+            finally:
+                await cur.close()
 
     async def _update_self(self):
         assert self.id is not None, "id must not be None for update operation"
         sql = SQL()
-        value_class = sql.get_sql_class(Value)
-        sql = sql.update(self.table).where(Eq("id", self.id))
+        placeholder = sql.get_sql_class(Placeholder)
+        sql = sql.update(self.table).where(
+            sql.get_sql_class(Eq)("id", placeholder("id"))
+        )
+        # the changed values are bound as parameters like the id
+        params = {"id": self.id}
+        attributes = self.attributes_as_dict()
         for k, v in self._data.items():
             if k != "id" and v != self.convert_from_db(
-                self._db_data[k], self.attributes_as_dict()[k]
+                self._db_data[k], attributes[k]
             ):
-                sql.assignment(k, value_class(v))
+                sql.assignment(k, placeholder(k))
+                params[k] = v
         try:
-            await sql.execute(close=0, commit=True)
+            async with App.db.acquire() as con:
+                cur = await sql.execute(params, commit=True, connection=con)
+                await cur.close()
         finally:
             await self.fetch()
 
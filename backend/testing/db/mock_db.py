@@ -0,0 +1,21 @@
+""" Test helper executing SQL statements on a mocked DB """
+
+from unittest.mock import Mock, patch
+
+from db.sqlexecutable import SQL
+from db.sqlfactory import SQLFactory
+
+
+class MockDBMixin:
+    """Mixin for test cases patching SQL._get_db to return a mock DB
+    with the SQL factory 'sql_factory'. The mock DB is self.mock_db."""
+
+    sql_factory = SQLFactory
+
+    def setUp(self) -> None:
+        get_db = patch.object(
+            SQL, "_get_db", return_value=Mock(sql_factory=self.sql_factory)
+        )
+        self.mock_db = get_db.start().return_value
+        self.addCleanup(get_db.stop)
+        return super().setUp()
@@ -20,8 +20,7 @@ class DB_ContextManager(unittest.IsolatedAsyncioTestCase):
         self.patch = patch.multiple(
             "db.db",
             App=self.MockApp,
-            SQLiteDB=self.MockSQLiteDB,
-            MySQLDB=self.MockMySQLDB,
+            _DRIVERS={"sqlite": self.MockSQLiteDB, "mysql": self.MockMySQLDB},
         )
         return super().setUp()
 
@@ -173,3 +172,51 @@ class DB_ContextManager(unittest.IsolatedAsyncioTestCase):
             self.MockMySQLDB.assert_called_once_with(**self.mock_db_config)
             self.mock_db.check.assert_not_called()
             self.mock_db.close.assert_not_called()
+
+
+class DB_LoadDriver(unittest.TestCase):
+    def test_001_load_driver_cached(self):
+        mock_db_class = Mock(name="DB")
+        with patch.dict("db.db._DRIVERS", {"sqlite": mock_db_class}):
+            self.assertIs(db.db._load_driver("sqlite"), mock_db_class)
+
+    def test_002_load_driver_imports_once(self):
+        with patch.dict("db.db._DRIVERS", clear=True):
+            db_class = db.db._load_driver("sqlite")
+            self.assertEqual(db_class.__name__, "SQLiteDB")
+            self.assertIs(db.db._DRIVERS["sqlite"], db_class)
+
+    def test_101_lazy_export(self):
+        mock_db_class = Mock(name="DB")
+        with (
+            patch.dict("db.db._DRIVERS", {"mysql": mock_db_class}),
+            patch.dict("db.db.__dict__"),
+        ):
+            db.db.__dict__.pop("MySQLDB", None)
+            self.assertIs(db.db.MySQLDB, mock_db_class)
+            self.assertIs(db.db.__dict__["MySQLDB"], mock_db_class)
+
+    def test_102_lazy_export_unknown(self):
+        with self.assertRaises(AttributeError):
+            db.db.NoSuchDB
+
+    def test_201_preload_driver(self):
+        mock_app = Mock(name="MockApp")
+        mock_app.status = Status.STATUS_DB_CFG
+        mock_app.configuration = {Config.CONFIG_DB: {Config.CONFIG_DB_FILE: "file"}}
+        with (
+            patch("db.db.App", mock_app),
+            patch("db.db._load_driver") as mock_load_driver,
+        ):
+            db.db.preload_driver()
+        mock_load_driver.assert_called_once_with("sqlite")
+
+    def test_202_preload_driver_no_db(self):
+        mock_app = Mock(name="MockApp")
+        mock_app.status = Status.STATUS_NO_DB
+        with (
+            patch("db.db.App", mock_app),
+            patch("db.db._load_driver") as mock_load_driver,
+        ):
+            db.db.preload_driver()
+        mock_load_driver.assert_not_called()
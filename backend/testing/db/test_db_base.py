@@ -1,5 +1,7 @@
 """ Test suite for DB connection base classes """
 
+import asyncio
+import functools
 import unittest
 from unittest.mock import Mock, PropertyMock, MagicMock, AsyncMock, patch, call
 
@@ -15,18 +17,26 @@ class TestDB(unittest.IsolatedAsyncioTestCase):
 
     def test_001_db(self):
         self.assertDictEqual(self.db._cfg, self.db_cfg)
-        self.assertEqual(self.db._connections, set())
+        self.assertEqual(set(self.db._connections), set())
 
-    def test_102_sql_callable_SELECT(self):
-        params = {"columns": ["col1", "col2"], "table": "tab"}
-        reply = self.db.sql(db.sql.SQL.SELECT, **params)
-        print(f"{reply=}")
-        self.assertEqual(reply, "SELECT col1,col2 FROM tab")
+    def test_102_sql_callable_UPDATE_ARGS(self):
+        params = {"columns": {"col1": 1, "col2": 2}, "table": "tab"}
+        reply = self.db.sql(db.sql.SQL.UPDATE_ARGS, **params)
+        self.assertEqual(
+            reply, "UPDATE tab SET col1 = :col1, col2 = :col2 WHERE id = :id"
+        )
 
     def test_103_sql_no_value(self):
         with self.assertRaises(ValueError):
             self.db.sql(db.sql.SQL.TABLE_LIST)
 
+    def test_104_sql_dispatch(self):
+        mock_render = Mock(return_value="mock_sql")
+        with patch.object(db.db_base.DB, "_sql_dispatch", {"MOCK": mock_render}):
+            reply = self.db.sql("MOCK", table="tab")
+        self.assertEqual(reply, "mock_sql")
+        mock_render.assert_called_once_with(self.db, table="tab")
+
     def _201_check_column(self, mock_sql):
         mock_attr = ("mock_attr", None)
         Mock_SQL = Mock()
@@ -45,13 +55,268 @@ class TestDB(unittest.IsolatedAsyncioTestCase):
     def test_202_check_column_no_tabcol(self):
         self.assertFalse(self._201_check_column(None))
 
+    async def test_203_check_table_closes_cursor(self):
+        mock_cur = AsyncMock()
+        mock_cur.fetchall.return_value = [
+            {"column_name": "id", "column_type": "INTEGER", "constraint": ""}
+        ]
+        mock_con = AsyncMock()
+        mock_con.execute.return_value = mock_cur
+        mock_obj = Mock(table="tab")
+        mock_obj.attribute_descriptions.return_value = [("id", int)]
+        self.db.check_column = Mock(return_value=True)
+        with (
+            patch("db.db_base.SQL"),
+            patch.object(self.db._pool, "acquire", AsyncMock(return_value=mock_con)),
+        ):
+            self.assertTrue(await self.db.check_table(mock_obj))
+        mock_cur.close.assert_awaited_once_with()
+        mock_con.close.assert_awaited_once_with()
+
     async def test_301_close(self):
         con1 = AsyncMock()
         con2 = AsyncMock()
         self.db._connections = {con1, con2}
         await self.db.close()
-        con1.close.assert_awaited_once_with()
-        con2.close.assert_awaited_once_with()
+        con1.disconnect.assert_awaited_once_with()
+        con2.disconnect.assert_awaited_once_with()
+
+    def _db_with_connect(self, connect) -> db.db_base.DB:
+        "DB opening its connections with 'connect'"
+        with patch("db.db_base.DB.connect", connect):
+            return db.db_base.DB(**self.db_cfg)
+
+    def _db_with_connections(self, description=("col",)) -> db.db_base.DB:
+        """DB opening Connections to mocked DB connections ('self.raw_cons'),
+        their statements return Cursors on mocked DB cursors ('self.raw_curs')
+        describing a result set with 'description'"""
+        self.raw_cons = []
+        self.raw_curs = []
+
+        async def execute(con, query, params=None, commit=False):
+            raw_cur = AsyncMock()
+            raw_cur.description = description
+            raw_cur.fetchone.return_value = None
+            raw_cur.fetchall.return_value = [] if description is None else ["row"]
+            self.raw_curs.append(raw_cur)
+            return db.db_base.Cursor(raw_cur, con)
+
+        async def connect():
+            con = db.db_base.Connection(test_db)
+            con._connection = AsyncMock()
+            con.execute = functools.partial(execute, con)
+            self.raw_cons.append(con._connection)
+            return con
+
+        test_db = self._db_with_connect(Mock(side_effect=connect))
+        return test_db
+
+    async def test_302_close_idle(self):
+        test_db = self._db_with_connections()
+        await test_db.prewarm()
+        await test_db.close()
+        self.raw_cons[0].close.assert_awaited_once_with()
+        self.assertEqual(set(test_db._connections), set())
+
+    async def test_303_close_lent(self):
+        test_db = self._db_with_connections()
+        async with test_db.acquire():
+            await test_db.close()
+        self.raw_cons[0].close.assert_awaited_once_with()
+
+    async def test_401_execute_reuses_pooled_connection(self):
+        test_db = self._db_with_connections()
+        await test_db.execute("ANY_SQL")
+        await test_db.execute("ANY_SQL")
+        self.assertEqual(len(self.raw_cons), 1)
+        self.assertEqual(len(self.raw_curs), 2)
+
+    async def test_402_acquire(self):
+        mock_con = AsyncMock()
+        test_db = self._db_with_connect(AsyncMock(return_value=mock_con))
+        async with test_db.acquire() as con:
+            self.assertIs(con, mock_con)
+            mock_con.close.assert_not_awaited()
+        mock_con.close.assert_awaited_once_with()
+
+    async def test_403_executemany(self):
+        mock_con = AsyncMock()
+        mock_con.executemany.return_value = 2
+        test_db = self._db_with_connect(AsyncMock(return_value=mock_con))
+        reply = await test_db.executemany("ANY_SQL", [{"a": 1}, {"a": 2}], True)
+        self.assertEqual(reply, 2)
+        mock_con.executemany.assert_awaited_once_with(
+            "ANY_SQL", [{"a": 1}, {"a": 2}], commit=True
+        )
+        mock_con.close.assert_awaited_once_with()
+
+    async def test_404_acquire_cursor_closes(self):
+        test_db = self._db_with_connections()
+        test_db._pool.release = AsyncMock()
+        async with test_db.acquire() as con:
+            await con.close()
+            test_db._pool.release.assert_not_awaited()
+        test_db._pool.release.assert_awaited_once_with(con)
+
+    async def test_405_execute_fetches_all(self):
+        test_db = self._db_with_connections()
+        test_db._pool.release = AsyncMock()
+        self.assertEqual(await test_db.execute("ANY_SQL"), ["row"])
+        test_db._pool.release.assert_awaited_once()
+        self.raw_curs[0].close.assert_awaited_once_with()
+
+    async def test_407_execute_no_result_set(self):
+        test_db = self._db_with_connections(description=None)
+        test_db._pool.release = AsyncMock()
+        self.assertEqual(await test_db.execute("ANY_SQL"), [])
+        test_db._pool.release.assert_awaited_once()
+        self.raw_curs[0].close.assert_awaited_once_with()
+
+    async def test_408_execute_error(self):
+        mock_con = AsyncMock()
+        mock_con.execute.side_effect = OSError
+        test_db = self._db_with_connect(AsyncMock(return_value=mock_con))
+        with self.assertRaises(OSError):
+            await test_db.execute("ANY_SQL")
+        mock_con.disconnect.assert_awaited_once_with()
+        mock_con.close.assert_not_awaited()
+
+    async def test_409_acquire_error_discards(self):
+        test_db = self._db_with_connections()
+        with self.assertRaises(OSError):
+            async with test_db.acquire() as con:
+                con._commit = True
+                raise OSError
+        self.raw_cons[0].commit.assert_not_awaited()
+        self.raw_cons[0].close.assert_awaited_once_with()
+        self.assertEqual(test_db._pool._idle.qsize(), 0)
+        async with test_db.acquire() as con:
+            pass
+        self.assertEqual(len(self.raw_cons), 2)
+
+
+class TestConnectionPool(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_factory = AsyncMock(side_effect=lambda: AsyncMock())
+        self.pool = db.db_base.ConnectionPool(
+            self.mock_factory, min_size=1, max_size=1
+        )
+        return super().setUp()
+
+    async def test_101_acquire_new(self):
+        con = await self.pool.acquire()
+        self.mock_factory.assert_awaited_once_with()
+        self.assertIsNotNone(con)
+
+    async def test_102_acquire_idle(self):
+        con = await self.pool.acquire()
+        await self.pool.release(con)
+        self.assertIs(await self.pool.acquire(), con)
+        self.mock_factory.assert_awaited_once_with()
+
+    async def test_201_acquire_bounded(self):
+        con = await self.pool.acquire()
+        waiting = asyncio.create_task(self.pool.acquire())
+        await asyncio.sleep(0)
+        self.assertFalse(waiting.done())
+        await self.pool.release(con)
+        self.assertIs(await waiting, con)
+        self.mock_factory.assert_awaited_once_with()
+
+    async def test_202_acquire_factory_error(self):
+        self.mock_factory.side_effect = OSError
+        with self.assertRaises(OSError):
+            await self.pool.acquire()
+        self.mock_factory.side_effect = lambda: AsyncMock()
+        self.assertIsNotNone(await self.pool.acquire())
+
+    async def test_203_release_twice(self):
+        con = await self.pool.acquire()
+        await self.pool.release(con)
+        await self.pool.release(con)
+        self.assertIs(await self.pool.acquire(), con)
+        self.assertEqual(self.pool._idle.qsize(), 0)
+
+    async def test_204_release_above_max_idle(self):
+        self.pool = db.db_base.ConnectionPool(
+            self.mock_factory, min_size=1, max_size=2, max_idle=1
+        )
+        con1 = await self.pool.acquire()
+        con2 = await self.pool.acquire()
+        await self.pool.release(con1)
+        await self.pool.release(con2)
+        con1.disconnect.assert_not_awaited()
+        con2.disconnect.assert_awaited_once_with()
+        self.assertEqual(self.pool._idle.qsize(), 1)
+        self.assertIs(await self.pool.acquire(), con1)
+        self.assertIsNot(await self.pool.acquire(), con2)
+
+    async def test_205_release_keeps_max_size(self):
+        self.pool = db.db_base.ConnectionPool(self.mock_factory, min_size=1, max_size=2)
+        cons = [await self.pool.acquire(), await self.pool.acquire()]
+        for con in cons:
+            await self.pool.release(con)
+            con.disconnect.assert_not_awaited()
+        self.assertEqual(self.pool._idle.qsize(), 2)
+
+    async def test_206_acquire_pings_idle(self):
+        con = await self.pool.acquire()
+        await self.pool.release(con)
+        con.ping.assert_not_awaited()
+        self.assertIs(await self.pool.acquire(), con)
+        con.ping.assert_awaited_once_with()
+
+    async def test_207_acquire_lost_idle(self):
+        con = await self.pool.acquire()
+        await self.pool.release(con)
+        con.ping.side_effect = OSError
+        self.assertIsNot(await self.pool.acquire(), con)
+        con.disconnect.assert_awaited_once_with()
+        self.assertEqual(self.mock_factory.await_count, 2)
+
+    async def test_208_discard(self):
+        con = await self.pool.acquire()
+        await self.pool.discard(con)
+        con.disconnect.assert_awaited_once_with()
+        self.assertEqual(self.pool._idle.qsize(), 0)
+        self.assertIsNot(await self.pool.acquire(), con)
+
+    async def test_301_prewarm(self):
+        await self.pool.prewarm(1)
+        self.mock_factory.assert_awaited_once_with()
+        con = await self.pool.acquire()
+        con.ping.assert_awaited()
+        self.mock_factory.assert_awaited_once_with()
+
+    async def test_302_prewarm_idle(self):
+        self.pool._idle.put_nowait(AsyncMock())
+        await self.pool.prewarm(1)
+        self.mock_factory.assert_not_awaited()
+
+    async def test_401_clear(self):
+        con = AsyncMock()
+        self.pool._idle.put_nowait(con)
+        await self.pool.clear()
+        con.disconnect.assert_awaited_once_with()
+        self.assertIsNot(await self.pool.acquire(), con)
+
+    async def test_402_clear_lent(self):
+        con = await self.pool.acquire()
+        await self.pool.clear()
+        con.disconnect.assert_awaited_once_with()
+        await self.pool.release(con)
+        self.assertIsNot(await self.pool.acquire(), con)
+        con.disconnect.assert_awaited_once_with()
+
+
+class TestColumnDefinitionSQL(unittest.TestCase):
+    def test_001_cached(self):
+        mock_factory = Mock()
+        mock_factory.get_sql_class.return_value.return_value.sql.return_value = "col"
+        attr = ("mock_col", int, None)
+        self.assertEqual(db.db_base.column_definition_sql(mock_factory, attr), "col")
+        self.assertEqual(db.db_base.column_definition_sql(mock_factory, attr), "col")
+        mock_factory.get_sql_class.return_value.assert_called_once_with(*attr)
 
 
 class TestDBConnection(unittest.IsolatedAsyncioTestCase):
@@ -69,15 +334,61 @@ class TestDBConnection(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(self.mock_db._connections, {self.con})
 
     async def test_201_close(self):
+        mock_con = AsyncMock()
+        self.con._connection = mock_con
+        self.mock_db.release = AsyncMock()
+        await self.con.close()
+        self.mock_db.release.assert_awaited_once_with(self.con)
+        mock_con.close.assert_not_awaited()
+        self.assertEqual(self.mock_db._connections, {self.con})
+        self.assertEqual(self.con._connection, mock_con)
+
+    async def test_202_disconnect(self):
         mock_con = AsyncMock()
         self.con._connection = mock_con
         mock_close = AsyncMock()
         mock_con.close = mock_close
-        await self.con.close()
+        await self.con.disconnect()
         mock_close.assert_awaited_once_with()
         self.assertEqual(self.mock_db._connections, set())
         self.assertIsNone(self.con._connection)
 
+    async def test_203_close_released(self):
+        self.con._connection = AsyncMock()
+        self.mock_db.release = AsyncMock(
+            side_effect=lambda con: setattr(con, "_released", True)
+        )
+        await self.con.close()
+        await self.con.close()
+        self.mock_db.release.assert_awaited_once_with(self.con)
+
+    async def test_204_close_rolls_back(self):
+        mock_con = AsyncMock()
+        self.con._connection = mock_con
+        self.mock_db.release = AsyncMock()
+        await self.con.close()
+        mock_con.rollback.assert_awaited_once_with()
+        mock_con.commit.assert_not_awaited()
+
+    async def test_205_close_commits(self):
+        mock_con = AsyncMock()
+        self.con._connection = mock_con
+        self.con._commit = True
+        self.mock_db.release = AsyncMock()
+        await self.con.close()
+        mock_con.commit.assert_awaited_once_with()
+        mock_con.rollback.assert_not_awaited()
+        self.assertFalse(self.con._commit)
+
+    async def test_206_close_held(self):
+        mock_con = AsyncMock()
+        self.con._connection = mock_con
+        self.con._held = True
+        self.mock_db.release = AsyncMock()
+        await self.con.close()
+        mock_con.rollback.assert_not_awaited()
+        self.mock_db.release.assert_not_awaited()
+
     def test_301_connection_prop(self):
         with patch(
             "db.db_base.Connection.connection", new_callable=PropertyMock
@@ -118,6 +429,22 @@ class TestCursor(unittest.IsolatedAsyncioTestCase):
         mock_fetchall.assert_awaited_once_with()
         self.assertEqual(reply, "mock_fetched")
 
+    async def test_202_aiter(self):
+        self.mock_cur.fetchmany.side_effect = [["row1", "row2"], ["row3"], []]
+        self.cur._arraysize = 2
+        self.mock_con.close = AsyncMock()
+        reply = [row async for row in self.cur]
+        self.assertEqual(reply, ["row1", "row2", "row3"])
+        self.assertEqual(self.mock_cur.fetchmany.await_args_list, [call(2)] * 3)
+        self.mock_con.close.assert_not_awaited()
+
+    async def test_203_fetchone(self):
+        self.mock_cur.fetchone.return_value = "row1"
+        self.mock_con.close = AsyncMock()
+        self.assertEqual(await self.cur.fetchone(), "row1")
+        self.mock_cur.close.assert_not_awaited()
+        self.mock_con.close.assert_not_awaited()
+
     async def test_301_close(self):
         mock_close = AsyncMock()
         self.mock_cur.close = mock_close
@@ -0,0 +1,39 @@
+""" Testsuite testing the modules loaded by importing the DB context manager """
+
+import os
+import subprocess
+import sys
+import unittest
+
+import db
+
+
+class DBImport(unittest.TestCase):
+
+    def _modules_after_import(self, env=None):
+        "import db.db in a fresh interpreter and return the names of the loaded modules"
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, db.db; print(' '.join(sys.modules))",
+            ],
+            cwd=os.path.dirname(list(db.__path__)[0]),
+            env=os.environ | (env or {}),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return set(result.stdout.split())
+
+    def test_101_drivers_not_imported(self):
+        modules = self._modules_after_import({"HBUCH_EAGER_IMPORT": "0"})
+        for mod in ["db.sqlite", "db.mysql", "aiosqlite", "aiomysql", "data"]:
+            with self.subTest(module=mod):
+                self.assertNotIn(mod, modules)
+
+    def test_102_eager_import(self):
+        modules = self._modules_after_import({"HBUCH_EAGER_IMPORT": "1"})
+        self.assertIn("db.sqlite", modules)
+        self.assertIn("db.mysql", modules)
+        self.assertNotIn("aiomysql", modules)
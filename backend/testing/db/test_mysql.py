@@ -31,6 +31,74 @@ def setUpModule():
 
 import db.db_base
 import db.sql
+from db.sqlexecutable import SQL
+from db.sqlexpression import Eq, Placeholder
+
+from .mock_db import MockDBMixin
+
+
+class TestMySQLSQLFactory(MockDBMixin, unittest.TestCase):
+    def setUp(self) -> None:
+        # db.mysql is imported by setUpModule
+        self.sql_factory = db.mysql.MySQLSQLFactory
+        return super().setUp()
+
+    def test_001_placeholder(self):
+        sql = SQL().select(["name"]).from_("users")
+        sql.where(sql.get_sql_class(Eq)("id", sql.get_sql_class(Placeholder)("id")))
+        self.assertEqual(sql.sql(), "SELECT name FROM users WHERE  (id = %(id)s) ")
+
+    def test_101_rows_batch(self):
+        insert = SQL().insert("users").rows_batch(["id", "name"], [(1, "a"), (2, "b")])
+        self.assertEqual(
+            insert.sql(), "INSERT INTO users (id, name) VALUES (%(id)s, %(name)s)"
+        )
+        self.assertEqual(
+            insert.batch_params(), [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        )
+
+    def test_102_columns_batch(self):
+        insert = SQL().insert("users").columns_batch({"id": [1, 2], "name": ["a", "b"]})
+        self.assertEqual(
+            insert.sql(), "INSERT INTO users (id, name) VALUES (%(id)s, %(name)s)"
+        )
+        self.assertEqual(
+            insert.batch_params(), [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        )
+
+    def test_103_bound_row(self):
+        insert = SQL().insert("users").bound_row([("id", 1), ("name", "a")])
+        self.assertEqual(
+            insert.sql(), "INSERT INTO users (id, name) VALUES (%(id)s, %(name)s)"
+        )
+        self.assertEqual(insert.bound_params(), {"id": 1, "name": "a"})
+
+
+class TestMySQLDB__init__(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_cfg = {
+            "host": "mockhost",
+            "db": "mockdb",
+            "user": "mockuser",
+            "password": "mockpw",
+        }
+        return super().setUp()
+
+    def test_001_MySQLDB(self):
+        db.mysql.AIOMYSQL_IMPORT_ERROR = None
+        with patch("db.db_base.DB.__init__") as mock_db_init:
+            db.mysql.MySQLDB(**self.db_cfg)
+            mock_db_init.assert_called_once_with(**self.db_cfg)
+
+    def test_002_MySQLDB_no_lib(self):
+        db.mysql.AIOMYSQL_IMPORT_ERROR = ModuleNotFoundError("Mock Error")
+        with (
+            self.assertRaises(ModuleNotFoundError),
+            patch("db.db_base.DB.__init__") as mock_db_init,
+        ):
+            db.mysql.MySQLDB(**self.db_cfg)
+        mock_db_init.assert_not_called()
+        db.mysql.AIOMYSQL_IMPORT_ERROR = None
 
 
 @unittest.skip("MySQL module is not maintained currently")
@@ -102,7 +170,7 @@ class TestMySQLConnection(unittest.IsolatedAsyncioTestCase):
         sys.modules["aiomysql"].connect = mock_mysql_connect
         reply = await self.con.connect()
         self.assertEqual(reply, self.con)
-        mock_mysql_connect.assert_awaited_once_with(**self.db_cfg)
+        mock_mysql_connect.assert_awaited_once_with(**self.db_cfg, autocommit=True)
 
     async def test_201_execute(self):
         sql = "ANY_SQL"
@@ -118,7 +186,7 @@ class TestMySQLConnection(unittest.IsolatedAsyncioTestCase):
                 con=self.con,
             )
             self.con._connection.cursor.assert_called_once_with()
-            mock_cur.execute.assert_awaited_once_with(sql)
+            mock_cur.execute.assert_awaited_once_with(sql, params=None)
 
 
 @asynccontextmanager
@@ -137,6 +205,16 @@ class TestMySQLCursor(unittest.IsolatedAsyncioTestCase):
         sql = "ANY_SQL"
         self.mock_cur.execute.return_value = 99
         self.cur._rowcount = 0
-        await self.cur.execute(sql)
-        self.mock_cur.execute.assert_awaited_once_with(sql)
+        reply = await self.cur.execute(sql)
+        self.assertEqual(reply, self.cur)
+        self.mock_cur.execute.assert_awaited_once_with(sql, None)
         self.assertEqual(self.cur._rowcount, self.mock_cur.execute.return_value)
+
+    async def test_103_execute_error(self):
+        self.mock_con.close = AsyncMock()
+        mock_close = self.mock_cur.close
+        self.mock_cur.execute.side_effect = OSError
+        with self.assertRaises(OSError):
+            await self.cur.execute("ANY_SQL")
+        mock_close.assert_awaited_once_with()
+        self.mock_con.close.assert_not_awaited()
@@ -7,6 +7,10 @@ import db.sql
 
 
 class TestSQL(unittest.TestCase):
-    def test_001_no_string_in_enum(self):
-        for sql in db.sql.SQL:
-            self.assertNotIsInstance(sql.value, str, msg=f"SQL.{sql.name}")
+    def test_001_keys_or_snippets(self):
+        for name, sql in vars(db.sql.SQL).items():
+            if not name.startswith("_"):
+                if isinstance(sql, str):
+                    self.assertEqual(sql, name, msg=f"SQL.{name}")
+                else:
+                    self.assertTrue(callable(sql), msg=f"SQL.{name}")
@@ -1,24 +1,51 @@
+import sys
+import types
 import unittest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch, sentinel
+
+import db.sqlexecutable
+import db.sqlexpression
 
 from db.sqlexpression import (
+    And,
+    Or,
     Eq,
     SQLBetween,
+    SQLBinaryExpression,
+    SQLMultiExpressin,
+    SQLTernaryExpression,
+    In,
+    From,
+    JoinOperator,
+    SQLExpression,
+    Row,
+    Value,
+    Values,
+    Assignment,
+    GroupBy,
+    Where,
 )
+from db.sqlfactory import SQLFactory, TRUE, FALSE
 
 from db.sqlexecutable import (
     SQLExecutable,
     SQL,
+    PreparedStatement,
     Select,
     CreateTable,
     Insert,
+    Update,
     InvalidSQLStatementException,
     SQLDataType,
     SQLStatement,
+    SQLScript,
+    SQLTemplate,
     SQLColumnDefinition,
     TableValuedQuery,
 )
 
+from .mock_db import MockDBMixin
+
 
 class MockColumnDefinition:
     def __init__(self, name: str, data_type: type, constraint: str = None):
@@ -40,7 +67,7 @@ class MockSQLFactory:
 
 
 class MockDB:
-    def execute(self, sql, params=None, close=False, commit=False):
+    def execute(self, sql, params=None, commit=False):
         return "Mock execute"
 
     def close(self):
@@ -62,7 +89,7 @@ class AsyncTestSQLExecutable(unittest.IsolatedAsyncioTestCase):
         SQLExecutable = self.sql
 
         # Test the execute method
-        await SQLExecutable.execute(params="params", close=True, commit=False)
+        await SQLExecutable.execute(params="params", commit=False)
         SQLExecutable.parent.execute.assert_called_once()
 
     async def test002_close(self):
@@ -200,6 +227,61 @@ class TestSQL(unittest.TestCase):
         self.assertEqual(result.strip(), "SELECT * FROM users WHERE  (id = 'test')")
 
 
+class TestSQLFactory(unittest.TestCase):
+
+    def test151_resolve_once(self):
+        """Test dialect classes are resolved once per factory"""
+
+        class TestFactory(SQLFactory):
+            get_sql_class = Mock(return_value=MockColumnDefinition)
+
+        self.assertIs(TestFactory.resolve(SQLColumnDefinition), MockColumnDefinition)
+        self.assertIs(TestFactory.resolve(SQLColumnDefinition), MockColumnDefinition)
+        TestFactory.get_sql_class.assert_called_once_with(SQLColumnDefinition)
+        self.assertNotIn(SQLColumnDefinition, SQLFactory._resolved)
+
+    def test152_sql_get_sql_class(self):
+        """Test SQL looks up the factory once"""
+        sql = SQL()
+        with patch.object(
+            SQL, "_get_db", return_value=Mock(sql_factory=MockSQLFactory)
+        ) as mock_get_db:
+            with patch.object(
+                MockSQLFactory, "resolve", create=True, return_value=Select
+            ):
+                self.assertIs(sql.get_sql_class(Select), Select)
+                self.assertIs(sql.get_sql_class(Select), Select)
+        mock_get_db.assert_called_once_with()
+
+    def test153_and_flattened(self):
+        """Test nested ANDs are flattened, TRUE and duplicates dropped"""
+        a, b, c = Eq("a", "1"), Eq("b", "2"), Eq("c", "3")
+        result = SQLFactory.and_(SQLFactory.and_(a, b), TRUE, c, Eq("a", "1"))
+        self.assertIsInstance(result, And)
+        self.assertEqual(result.arguments, [a, b, c])
+
+    def test154_absorbing(self):
+        """Test FALSE absorbs an AND and TRUE absorbs an OR"""
+        self.assertIs(SQLFactory.and_(Eq("a", "1"), "0=1"), FALSE)
+        self.assertIs(SQLFactory.or_(Eq("a", "1"), TRUE), TRUE)
+
+    def test155_single_or_none(self):
+        """Test a single condition is returned as is and no condition as neutral"""
+        a = Eq("a", "1")
+        self.assertIs(SQLFactory.or_(a, FALSE), a)
+        self.assertIs(SQLFactory.and_(), TRUE)
+        self.assertIs(SQLFactory.or_(), FALSE)
+
+    def test156_or_eq_chain_as_in(self):
+        """Test an OR chain comparing one column with numbers is combined as IN"""
+        result = SQLFactory.or_(Eq("id", 1), Eq("id", 2), Eq("id", 3))
+        self.assertIsInstance(result, In)
+        self.assertEqual(result.sql(), " (id IN (1, 2, 3)) ")
+        self.assertIsInstance(SQLFactory.or_(Eq("id", 1), Eq("no", 2)), Or)
+        self.assertIsInstance(SQLFactory.or_(Eq("id", 1), Eq("id", "no")), Or)
+        self.assertIsInstance(SQLFactory.and_(Eq("id", 1), Eq("id", 2)), And)
+
+
 class TestSQLStatement(unittest.TestCase):
 
     def test201_exception(self):
@@ -208,6 +290,54 @@ class TestSQLStatement(unittest.TestCase):
             SQLStatement().sql()
 
 
+class TestSQLScript(unittest.TestCase):
+
+    class Script(SQLScript):
+        __slots__ = ()
+
+        sql_templates = {
+            SQLTemplate.TABLEINFO: "SELECT '{{x}}' FROM {table} WHERE name = '{table}'",
+            SQLTemplate.TABLELIST: "SELECT {limit:>3} FROM t",
+        }
+
+    def test251_template(self):
+        """Test filling a precompiled template is equivalent to str.format"""
+        test = self.Script(SQLTemplate.TABLEINFO, parent=Mock(), table="users")
+        self.assertEqual(test.sql(), "SELECT '{x}' FROM users WHERE name = 'users'")
+
+    def test252_format_spec(self):
+        """Test templates with format specs fall back to str.format"""
+        self.assertIsNone(self.Script._compiled_templates[SQLTemplate.TABLELIST])
+        test = self.Script(SQLTemplate.TABLELIST, parent=Mock(), limit=5)
+        self.assertEqual(test.sql(), "SELECT   5 FROM t")
+
+    def test253_verbatim(self):
+        self.assertEqual(SQLScript("SELECT 1", parent=Mock()).sql(), "SELECT 1")
+
+    def test254_field_expressions(self):
+        """Test templates with fields other than plain names fall back to str.format"""
+
+        class Script(SQLScript):
+            __slots__ = ()
+
+            sql_templates = {
+                SQLTemplate.TABLEINFO: "SELECT {columns[0]} FROM {table.name}",
+                SQLTemplate.TABLELIST: "SELECT {} FROM t",
+            }
+
+        self.assertIsNone(Script._compiled_templates[SQLTemplate.TABLEINFO])
+        self.assertIsNone(Script._compiled_templates[SQLTemplate.TABLELIST])
+        test = Script(
+            SQLTemplate.TABLEINFO,
+            parent=Mock(),
+            columns=["id"],
+            table=types.SimpleNamespace(name="users"),
+        )
+        self.assertEqual(test.sql(), "SELECT id FROM users")
+        with self.assertRaises(IndexError):
+            Script(SQLTemplate.TABLELIST, parent=Mock())
+
+
 class TestSQLColumnDefinition(unittest.TestCase):
 
     def test301_name(self):
@@ -250,6 +380,217 @@ class TestCreateTable(unittest.TestCase):
                     self.assertEqual(column.data_type, "SQLDataType." + type.name)
 
 
+class TestCreateTableSQL(unittest.TestCase):
+
+    def test411_sql(self):
+        """Test rendering a table with several columns"""
+        mockParent = Mock()
+        mockParent.get_sql_class = MockSQLFactory.get_sql_class
+        test = CreateTable(
+            "users", [("id", "INT", "PK"), ("name", "TEXT", "")], parent=mockParent
+        )
+        self.assertEqual(test.sql(), "CREATE TABLE users (id INT PK, name TEXT )")
+
+    def test412_cached(self):
+        """Test the rendered statement is cached until a column is added"""
+        mockParent = Mock()
+        mockParent.get_sql_class = MockSQLFactory.get_sql_class
+        test = CreateTable("users", [("id", "INT", "PK")], parent=mockParent)
+        with patch.object(
+            CreateTable, "_render", return_value="mock_sql"
+        ) as mock_render:
+            self.assertEqual(test.sql(), "mock_sql")
+            self.assertEqual(test.sql(), "mock_sql")
+            mock_render.assert_called_once_with()
+            test.column("name", "TEXT", "")
+            test.sql()
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test413_column(self):
+        """Test adding columns to an empty and a non-empty column list"""
+        mockParent = Mock()
+        mockParent.get_sql_class = MockSQLFactory.get_sql_class
+        test = CreateTable("users", parent=mockParent)
+        test.column("id", "INT", "PK")
+        self.assertEqual(test.sql(), "CREATE TABLE users (id INT PK)")
+        test.column("name", "TEXT", "")
+        self.assertEqual(test.sql(), "CREATE TABLE users (id INT PK, name TEXT )")
+
+
+class TestInsertBatch(MockDBMixin, unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.rows = [(1, "a"), (2, "b")]
+        self.sql = SQL()
+        self.mock_db.executemany = AsyncMock(return_value=2)
+        self.mock_db.execute = AsyncMock()
+
+    def test421_sql(self):
+        """Test a rows batch renders one placeholder per column"""
+        test = self.sql.insert("users").rows_batch(["id", "name"], self.rows)
+        self.assertEqual(test.sql(), "INSERT INTO users (id, name) VALUES (:id, :name)")
+
+    def test422_batch_params(self):
+        """Test the parameter sets of a rows batch"""
+        test = self.sql.insert("users").rows_batch(["id", "name"], self.rows)
+        self.assertEqual(
+            test.batch_params(), [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        )
+        self.assertIsNone(self.sql.insert("users").batch_params())
+
+    async def test423_execute(self):
+        """Test a rows batch is executed through executemany"""
+        self.sql.insert("users").rows_batch(["id", "name"], self.rows)
+        self.assertEqual(await self.sql.execute(commit=True), 2)
+        self.mock_db.executemany.assert_awaited_once_with(
+            "INSERT INTO users (id, name) VALUES (:id, :name)",
+            [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+            True,
+        )
+        self.mock_db.execute.assert_not_awaited()
+        # the rows batch binds its own parameters
+        with self.assertRaises(InvalidSQLStatementException):
+            await self.sql.execute(params={"id": 1})
+        self.mock_db.executemany.assert_awaited_once()
+
+    def test424_columns_batch(self):
+        """Test a column-major batch renders and binds like a rows batch"""
+        test = self.sql.insert("users").columns_batch(
+            {"id": [1, 2], "name": ["a", "b"]}
+        )
+        self.assertEqual(test.sql(), "INSERT INTO users (id, name) VALUES (:id, :name)")
+        self.assertEqual(
+            test.batch_params(), [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        )
+
+    def test425_returning(self):
+        """Test a rows batch with a RETURNING clause"""
+        returning = (
+            SQL().insert("users").rows_batch(["id", "name"], self.rows).returning("id")
+        )
+        self.assertEqual(
+            returning.sql(),
+            "INSERT INTO users (id, name) VALUES (:id, :name) RETURNING id",
+        )
+
+
+class TestInsertBoundRow(MockDBMixin, unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.sql = SQL()
+        self.mock_db.execute = AsyncMock(return_value=sentinel.CURSOR)
+        self.mock_db.executemany = AsyncMock()
+
+    async def test426_bound_row(self):
+        """Test a bound row renders placeholders and executes with its values"""
+        test = self.sql.insert("users").bound_row([("id", 1), ("name", "a")])
+        test.returning("id")
+        self.assertEqual(
+            test.sql(), "INSERT INTO users (id, name) VALUES (:id, :name) RETURNING id"
+        )
+        self.assertIsNone(test.batch_params())
+        self.assertEqual(test.bound_params(), {"id": 1, "name": "a"})
+        self.assertEqual(await self.sql.execute(), sentinel.CURSOR)
+        self.mock_db.execute.assert_awaited_once_with(
+            "INSERT INTO users (id, name) VALUES (:id, :name) RETURNING id",
+            {"id": 1, "name": "a"},
+            False,
+        )
+        self.mock_db.executemany.assert_not_awaited()
+
+    async def test428_execute_on_connection(self):
+        """Test a statement executed on a lent connection returns its cursor"""
+        self.sql.insert("users").bound_row([("id", 1)])
+        mock_con = AsyncMock()
+        mock_con.execute.return_value = sentinel.CURSOR
+        reply = await self.sql.execute(commit=True, connection=mock_con)
+        self.assertEqual(reply, sentinel.CURSOR)
+        mock_con.execute.assert_awaited_once_with(
+            "INSERT INTO users (id) VALUES (:id)", {"id": 1}, commit=True
+        )
+        self.mock_db.execute.assert_not_awaited()
+
+    def test427_rows_batch_replaces_bound_row(self):
+        test = self.sql.insert("users").bound_row([("id", 1)])
+        test.rows_batch(["id"], [(2,), (3,)])
+        self.assertIsNone(test.bound_params())
+        self.assertEqual(test.batch_params(), [{"id": 2}, {"id": 3}])
+
+
+class TestPreparedStatement(MockDBMixin, unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.mock_db.execute = AsyncMock(return_value=sentinel.CURSOR)
+        self.mock_db.executemany = AsyncMock(return_value=2)
+
+    async def test431_execute(self):
+        """Test a prepared statement is rendered once and executed with parameters"""
+        sql = SQL()
+        sql.select(["name"]).from_("users").where(Eq("id", ":id"))
+        with patch.object(Select, "_render", return_value="mock_sql") as mock_render:
+            prepared = sql.prepare()
+            self.assertIsInstance(prepared, PreparedStatement)
+            self.assertEqual(await prepared.execute({"id": 1}), sentinel.CURSOR)
+            await prepared.execute({"id": 2}, commit=True)
+        mock_render.assert_called_once_with()
+        self.mock_db.execute.assert_awaited_with("mock_sql", {"id": 2}, True)
+        self.assertEqual(self.mock_db.execute.await_count, 2)
+
+    async def test434_execute_on_connection(self):
+        """Test a prepared statement executes on a connection lent by the DB"""
+        prepared = SQL().select(["name"]).from_("users").prepare()
+        mock_con = AsyncMock()
+        mock_con.execute.return_value = sentinel.CURSOR
+        reply = await prepared.execute({"id": 1}, connection=mock_con)
+        self.assertEqual(reply, sentinel.CURSOR)
+        mock_con.execute.assert_awaited_once_with(
+            "SELECT name FROM users", {"id": 1}, commit=False
+        )
+        self.mock_db.execute.assert_not_awaited()
+
+    async def test435_bound_row(self):
+        """Test a prepared bound row executes with its values by default"""
+        prepared = SQL().insert("users").bound_row([("id", 1)]).prepare()
+        await prepared.execute()
+        self.mock_db.execute.assert_awaited_once_with(
+            "INSERT INTO users (id) VALUES (:id)", {"id": 1}, False
+        )
+        await prepared.execute({"id": 2})
+        self.mock_db.execute.assert_awaited_with(
+            "INSERT INTO users (id) VALUES (:id)", {"id": 2}, False
+        )
+
+    async def test436_rows_batch(self):
+        """Test a prepared rows batch executes its rows by default"""
+        prepared = SQL().insert("users").rows_batch(["id"], [(1,), (2,)]).prepare()
+        self.assertEqual(await prepared.execute(commit=True), 2)
+        self.mock_db.executemany.assert_awaited_once_with(
+            "INSERT INTO users (id) VALUES (:id)", [{"id": 1}, {"id": 2}], True
+        )
+        self.assertEqual(await prepared.executemany(), 2)
+        self.mock_db.executemany.assert_awaited_with(
+            "INSERT INTO users (id) VALUES (:id)", [{"id": 1}, {"id": 2}], False
+        )
+        self.mock_db.execute.assert_not_awaited()
+
+    async def test432_executemany(self):
+        """Test a prepared statement executes many parameter sets at once"""
+        prepared = SQL().update("users").assignment("name", Value("name", ":name"))
+        prepared = prepared.where(Eq("id", ":id")).prepare()
+        params = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        self.assertEqual(await prepared.executemany(params, commit=True), 2)
+        self.mock_db.executemany.assert_awaited_once_with(
+            "UPDATE users SET name = :name WHERE  (id = :id) ", params, True
+        )
+
+    def test433_no_statement(self):
+        with self.assertRaises(InvalidSQLStatementException):
+            SQL().prepare()
+
+
 class TestTableValuedQuery(unittest.TestCase):
 
     def test501_parent(self):
@@ -319,12 +660,388 @@ class TestSelect(unittest.TestCase):
         self.assertTrue(test.distinct)
 
 
+class TestSelectClauses(unittest.TestCase):
+    """Test rendering the optional clauses of a Select"""
+
+    def setUp(self) -> None:
+        self.mockParent = Mock()
+        self.mockParent.get_sql_class = SQLFactory.get_sql_class
+
+    def test711_no_clauses(self):
+        test = Select(["name"], parent=self.mockParent).from_("users")
+        self.assertEqual(test.sql(), "SELECT name FROM users")
+
+    def test712_all_clauses(self):
+        test = (
+            Select(["name", "count(*)"], parent=self.mockParent)
+            .from_("users")
+            .where(Eq("age", "18"))
+            .group_by(["name"])
+            .having(SQLExpression("count(*) > 1"))
+        )
+        self.assertEqual(
+            test.sql(),
+            "SELECT name, count(*) FROM users WHERE  (age = 18) "
+            " GROUP BY name HAVING count(*) > 1",
+        )
+
+    def test713_having_without_group_by(self):
+        test = (
+            Select(["count(*)"], parent=self.mockParent)
+            .from_("users")
+            .having(SQLExpression("count(*) > 1"))
+        )
+        self.assertEqual(test.sql(), "SELECT count(*) FROM users HAVING count(*) > 1")
+
+    def test714_invalidated_by_builder(self):
+        test = Select(["name"], parent=self.mockParent).from_("users")
+        self.assertEqual(test.sql(), "SELECT name FROM users")
+        test.distinct().where(Eq("age", "18"))
+        self.assertEqual(
+            test.sql(), "SELECT DISTINCT name FROM users WHERE  (age = 18) "
+        )
+
+    def test715_columns_changed(self):
+        test = Select(["name"], distinct=True, parent=self.mockParent)
+        test.from_("users")
+        self.assertEqual(test.sql(), "SELECT DISTINCT name FROM users")
+        test.all().columns(["id", "name"])
+        self.assertEqual(test.sql(), "SELECT id, name FROM users")
+        test.columns([])
+        self.assertEqual(test.sql(), "SELECT * FROM users")
+
+    def test716_subquery_changed(self):
+        """Test a select from a subquery renders the changes made to the subquery"""
+        inner = Select(["id"], parent=self.mockParent).from_("users")
+        outer = Select(["id"], parent=self.mockParent).from_(inner)
+        self.assertEqual(outer.sql(), "SELECT id FROM (SELECT id FROM users)")
+        inner.where(Eq("age", "18"))
+        self.assertEqual(
+            outer.sql(), "SELECT id FROM (SELECT id FROM users WHERE  (age = 18) )"
+        )
+
+    def test717_group_by_column(self):
+        test = Select(["name", "age"], parent=self.mockParent).from_("users")
+        self.assertEqual(
+            test.group_by_column("name").sql(),
+            "SELECT name, age FROM users GROUP BY name",
+        )
+        self.assertEqual(
+            test.group_by_column("age").sql(),
+            "SELECT name, age FROM users GROUP BY name, age",
+        )
+
+    def test718_group_by_add_column(self):
+        """Test adding a column to the clause invalidates the select"""
+        test = Select(["name", "age"], parent=self.mockParent).from_("users")
+        test.group_by(["name"])
+        self.assertEqual(test.sql(), "SELECT name, age FROM users GROUP BY name")
+        test._group_by.add_column("age")
+        self.assertEqual(test.sql(), "SELECT name, age FROM users GROUP BY name, age")
+
+    def test719_numeric_condition(self):
+        test = Select(["name"], parent=self.mockParent).from_("users")
+        test.where(SQLExpression(1))
+        self.assertEqual(test.sql(), "SELECT name FROM users WHERE 1")
+        test.group_by(["name"]).having(SQLExpression(1))
+        self.assertEqual(
+            test.sql(), "SELECT name FROM users WHERE 1 GROUP BY name HAVING 1"
+        )
+
+    def test720_column_list_copied(self):
+        """Test changing the caller's column list does not change the select"""
+        column_list = ["name"]
+        test = Select(column_list, parent=self.mockParent).from_("users")
+        column_list.append("age")
+        self.assertEqual(test.sql(), "SELECT name FROM users")
+        test.columns(column_list)
+        column_list.append("id")
+        self.assertEqual(test.sql(), "SELECT name, age FROM users")
+
+
+class TestExpressionCache(unittest.TestCase):
+    """Test caching of rendered expressions"""
+
+    def test901_cached(self):
+        expression = Eq("id", "1")
+        with patch.object(Eq, "_render", return_value="mock_sql") as mock_render:
+            self.assertEqual(expression.sql(), "mock_sql")
+            self.assertEqual(expression.sql(), "mock_sql")
+        mock_render.assert_called_once_with()
+
+    def test902_invalidated_by_mutation(self):
+        row = Row([Value("id", 1)])
+        self.assertEqual(row.sql(), "(1)")
+        row.value(Value("name", "'x'"))
+        self.assertEqual(row.sql(), "(1, 'x')")
+
+    def test903_multi_expression(self):
+        expression = And([Eq("a", "1"), Or([Eq("b", "2"), SQLExpression("c")])])
+        self.assertEqual(expression.sql(), " ((a = 1) AND ((b = 2) OR c)) ")
+
+    def test904_deep_nesting(self):
+        """Test rendering conditions nested deeper than the recursion limit"""
+        depth = sys.getrecursionlimit() + 100
+        expression = Eq("a", "1")
+        for _ in range(depth):
+            expression = Or([expression, SQLExpression("b")])
+        sql = expression.sql()
+        self.assertTrue(sql.startswith(" " + "(" * depth + "(a = 1) OR b) "))
+        self.assertEqual(sql.count(" OR b)"), depth)
+
+    def test905_interned_leaves(self):
+        """Test repeated string operands share one expression"""
+        first, second = Eq("users.id", "1"), Eq("users.id", "1.0")
+        self.assertIs(first.left, second.left)
+        self.assertIsNot(first.right, second.right)
+        self.assertIs(SQLExpression.intern("x"), SQLExpression.intern("x"))
+
+    def test906_numbers_not_interned(self):
+        """Test equal numbers of different types render separately"""
+        self.assertEqual(Eq("a", 1).sql(), " (a = 1) ")
+        self.assertEqual(Eq("a", 1.0).sql(), " (a = 1.0) ")
+
+    def test907_row_mutation_invalidates_values(self):
+        row = Row([Value("a", 1)])
+        values = Values([row])
+        self.assertEqual(values.sql(), "VALUES (1)")
+        row.value(Value("b", 2))
+        self.assertEqual(values.sql(), "VALUES (1, 2)")
+
+    def test908_row_mutation_invalidates_insert(self):
+        parent = Mock(get_sql_class=SQLFactory.get_sql_class)
+        insert = Insert("users", [[("id", 1)]], parent=parent)
+        self.assertEqual(insert.sql(), "INSERT INTO users (id) VALUES (1)")
+        insert._values.rows[0].value(Value("name", "'x'"))
+        self.assertEqual(insert.sql(), "INSERT INTO users (id, name) VALUES (1, 'x')")
+
+    def test909_join_invalidates_select(self):
+        parent = Mock(get_sql_class=SQLFactory.get_sql_class)
+        select = Select(["a"], parent=parent).from_("t")
+        self.assertEqual(select.sql(), "SELECT a FROM t")
+        select._from_statement.join("u", Eq("t.id", "u.id"), JoinOperator.INNER)
+        self.assertEqual(
+            select.sql(), "SELECT a FROM t INNER JOIN u ON  (t.id = u.id) "
+        )
+
+
+class TestValues(unittest.TestCase):
+
+    def test951_rows(self):
+        values = Values(
+            [Row([Value("id", 1), Value("name", "'x'")]), Row([Value("id", 2)])]
+        )
+        self.assertEqual(values.sql(), "VALUES (1, 'x'), (2)")
+
+    def test952_empty(self):
+        self.assertEqual(Values([Row()]).sql(), "VALUES ()")
+        self.assertEqual(Values([]).sql(), "VALUES ")
+
+    def test953_row_added_after_render(self):
+        values = Values([])
+        self.assertEqual(values.sql(), "VALUES ")
+        values.row(Row([Value("id", 1)]))
+        self.assertEqual(values.sql(), "VALUES (1)")
+        values.row(Row([Value("id", 2)]))
+        self.assertEqual(values.sql(), "VALUES (1), (2)")
+
+    def test954_rendered_and_unrendered_rows(self):
+        rendered = Row([Value("id", 1), Value("name", "'x'")])
+        self.assertEqual(rendered.sql(), "(1, 'x')")
+        values = Values([rendered, Row([Value("id", 2), Value("name", "'y'")])])
+        self.assertEqual(values.sql(), "VALUES (1, 'x'), (2, 'y')")
+
+
+class TestAssignment(unittest.TestCase):
+
+    def test961_single_column(self):
+        self.assertEqual(Assignment("name", Value("name", "'x'")).sql(), "name = 'x'")
+
+    def test962_columns(self):
+        test = Assignment(["a", "b"], SQLExpression("(1, 2)"))
+        self.assertEqual(test.sql(), "a, b = (1, 2)")
+
+    def test963_where(self):
+        test = Assignment("a", Value("a", 1))
+        test.where = Where(Eq("id", "2"))
+        self.assertEqual(test.sql(), "a = 1 WHERE  (id = 2) ")
+
+    def test964_group_by(self):
+        self.assertEqual(GroupBy(["a", "b"]).sql(), " GROUP BY a, b")
+
+    def test965_update(self):
+        mockParent = Mock()
+        mockParent.get_sql_class = SQLFactory.get_sql_class
+        test = (
+            Update("users", parent=mockParent)
+            .assignment("name", Value("name", "'x'"))
+            .where(Eq("id", ":id"))
+        )
+        self.assertEqual(test.sql(), "UPDATE users SET name = 'x' WHERE  (id = :id) ")
+        test.returning("id")
+        self.assertEqual(
+            test.sql(), "UPDATE users SET name = 'x' WHERE  (id = :id)  RETURNING id"
+        )
+
+    def test966_group_by_add_column(self):
+        test = GroupBy([])
+        self.assertEqual(test.add_column("a").sql(), " GROUP BY a")
+        self.assertEqual(test.add_column("b").sql(), " GROUP BY a, b")
+        columns = ["a"]
+        self.assertEqual(GroupBy(columns).add_column("b").sql(), " GROUP BY a, b")
+        self.assertEqual(columns, ["a"])
+
+    def test967_where_after_render(self):
+        """Test assigning the where clause invalidates the cached assignment"""
+        test = Assignment("a", Value("a", 1))
+        self.assertEqual(test.sql(), "a = 1")
+        test.where = Where(Eq("id", "2"))
+        self.assertEqual(test.sql(), "a = 1 WHERE  (id = 2) ")
+        test.where = None
+        self.assertEqual(test.sql(), "a = 1")
+
+    def test968_update_where_after_render(self):
+        """Test assigning the where clause of an assignment invalidates the update"""
+        mockParent = Mock()
+        mockParent.get_sql_class = SQLFactory.get_sql_class
+        test = Update("t", parent=mockParent).assignment("a", Value("a", 1))
+        self.assertEqual(test.sql(), "UPDATE t SET a = 1")
+        test.assignments[0].where = Where(Eq("id", "2"))
+        self.assertEqual(test.sql(), "UPDATE t SET a = 1 WHERE  (id = 2) ")
+
+    def test969_update_assignments_read_only(self):
+        """Test assignments are only added through Update.assignment()"""
+        mockParent = Mock()
+        mockParent.get_sql_class = SQLFactory.get_sql_class
+        test = Update("t", parent=mockParent).assignment("a", Value("a", 1))
+        self.assertEqual(test.sql(), "UPDATE t SET a = 1")
+        with self.assertRaises(AttributeError):
+            test.assignments.append(Assignment("b", Value("b", 2)))
+        test.assignment("b", Value("b", 2))
+        self.assertEqual(test.sql(), "UPDATE t SET a = 1, b = 2")
+
+
 class TestSQL_between(unittest.TestCase):
 
     def test601_between(self):
-        result = SQL_between("age", 18, 25)
+        result = SQLBetween("age", 18, 25)
         self.assertEqual(result.sql(), " (age BETWEEN 18 AND 25) ")
 
+    def test602_abstract(self):
+        """Test expressions without operators cannot be rendered"""
+        for expression in (
+            SQLMultiExpressin([SQLExpression("a"), SQLExpression("b")]),
+            SQLBinaryExpression("a", "b"),
+            SQLTernaryExpression("a", "b", "c"),
+        ):
+            with self.assertRaises(NotImplementedError):
+                expression.sql()
+
+
+class TestIn(unittest.TestCase):
+
+    def test611_in(self):
+        result = In("id", [1, 2, 3])
+        self.assertEqual(result.sql(), " (id IN (1, 2, 3)) ")
+
+    def test612_in_strings_quoted(self):
+        result = In("name", ["a", "b'); DROP TABLE users; --"])
+        self.assertEqual(
+            result.sql(), " (name IN ('a', 'b''); DROP TABLE users; --')) "
+        )
+
+    def test613_in_invalid_value(self):
+        with self.assertRaises(TypeError):
+            In("id", [object()]).sql()
+
+
+class TestFrom(unittest.TestCase):
+
+    def test801_from(self):
+        self.assertEqual(From("users").sql(), " FROM users")
+
+    def test802_join(self):
+        from_ = From("users")
+        from_.join("roles", Eq("users.role", "roles.id"), JoinOperator.LEFT)
+        self.assertEqual(
+            from_.sql(), " FROM users LEFT JOIN roles ON  (users.role = roles.id) "
+        )
+
+    def test803_join_after_render(self):
+        from_ = From("users")
+        self.assertEqual(from_.sql(), " FROM users")
+        from_.join("roles", Eq("users.role", "roles.id"), JoinOperator.INNER)
+        self.assertEqual(
+            from_.sql(), " FROM users INNER JOIN roles ON  (users.role = roles.id) "
+        )
+
+    def test804_subquery(self):
+        """Test table valued queries are rendered as parenthesized subqueries"""
+        from_ = From(SQLExpression("SELECT id FROM users"))
+        from_.join(
+            SQLExpression("SELECT id FROM roles"), Eq("id", "id"), JoinOperator.LEFT
+        )
+        self.assertEqual(
+            from_.sql(),
+            " FROM (SELECT id FROM users) LEFT JOIN (SELECT id FROM roles) ON "
+            " (id = id) ",
+        )
+
+    def test805_subquery_changed_after_join(self):
+        """Test a joined query is rendered with the changes made after the join"""
+        parent = Mock(get_sql_class=SQLFactory.get_sql_class)
+        roles = Select(["id"], parent=parent).from_("roles")
+        from_ = From("users")
+        self.assertEqual(from_.sql(), " FROM users")
+        from_.join(roles, Eq("users.role", "id"), JoinOperator.LEFT)
+        roles.where(Eq("active", "1"))
+        self.assertEqual(
+            from_.sql(),
+            " FROM users LEFT JOIN (SELECT id FROM roles WHERE  (active = 1) ) ON "
+            " (users.role = id) ",
+        )
+
+    def test806_table_join_after_subquery(self):
+        """Test joined tables are rendered after a join of a changed query"""
+        parent = Mock(get_sql_class=SQLFactory.get_sql_class)
+        roles = Select(["id"], parent=parent).from_("roles")
+        from_ = From("users")
+        from_.join(roles, Eq("users.role", "id"), JoinOperator.LEFT)
+        from_.join("groups", Eq("users.grp", "groups.id"), JoinOperator.INNER)
+        self.assertEqual(
+            from_.sql(),
+            " FROM users LEFT JOIN (SELECT id FROM roles) ON  (users.role = id)  "
+            "INNER JOIN groups ON  (users.grp = groups.id) ",
+        )
+        roles.columns(["id", "name"])
+        self.assertEqual(
+            from_.sql(),
+            " FROM users LEFT JOIN (SELECT id, name FROM roles) ON  (users.role = id)  "
+            "INNER JOIN groups ON  (users.grp = groups.id) ",
+        )
+
+    def test807_invalid_table(self):
+        """Test only tables and table valued queries are selected from or joined"""
+        with self.assertRaises(ValueError):
+            From(None)
+        from_ = From("users")
+        with self.assertRaises(ValueError):
+            from_.join(None, Eq("id", "id"))
+        self.assertEqual(from_.sql(), " FROM users")
+
+
+class TestSlots(unittest.TestCase):
+
+    def test991_no_instance_dict(self):
+        """Test all expression and statement classes are slotted"""
+        for module in (db.sqlexpression, db.sqlexecutable):
+            for name, cls in vars(module).items():
+                if isinstance(cls, type) and issubclass(
+                    cls, (SQLExpression, SQLExecutable)
+                ):
+                    with self.subTest(cls=name):
+                        self.assertEqual(cls.__dictoffset__, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
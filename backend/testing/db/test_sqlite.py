@@ -42,6 +42,9 @@ def setUpModule() -> None:
 
 import db.db_base
 import db.sql
+import db.sqlite
+
+from .mock_db import MockDBMixin
 
 
 class TestSQLiteDB__init__(unittest.TestCase):
@@ -173,7 +176,10 @@ class TestSQLiteConnection(unittest.IsolatedAsyncioTestCase):
             mock_sqlite.connect = mock_sqlite_connect
             reply = await self.con.connect()
         self.assertEqual(reply, self.con)
-        mock_sqlite_connect.assert_awaited_once_with(database=self.db_cfg["file"])
+        mock_sqlite_connect.assert_awaited_once_with(
+            database=self.db_cfg["file"],
+            cached_statements=db.sqlite.SQLiteConnection.cached_statements,
+        )
         self.assertEqual(self.con._connection, mock_aioconnection)
 
         # test rowfactory
@@ -183,8 +189,11 @@ class TestSQLiteConnection(unittest.IsolatedAsyncioTestCase):
         mock_row = tuple(mock_result.values())
         result = mock_aioconnection.row_factory(mock_cursor, mock_row)
         self.assertEqual(result, mock_result)
+        mock_cursor.description = [("other",)]
+        result = mock_aioconnection.row_factory(mock_cursor, ("val",))
+        self.assertEqual(result, {"other": "val"})
 
-    async def _201_execute(self, params=DEFAULT, close=DEFAULT, commit=DEFAULT):
+    async def _201_execute(self, params=DEFAULT, commit=DEFAULT):
         sql = "ANY_SQL"
         mock_cur = AsyncMock()
         MockCursor = Mock(return_value=mock_cur)
@@ -193,33 +202,21 @@ class TestSQLiteConnection(unittest.IsolatedAsyncioTestCase):
         self.con._connection.cursor.return_value = mock_aiocursor
         self.con.commit = sentinel.COMMIT
         with (patch("db.sqlite.SQLiteCursor", MockCursor),):
-            if params is DEFAULT and close is DEFAULT and commit is DEFAULT:
+            if params is DEFAULT and commit is DEFAULT:
                 reply = await self.con.execute(sql)
-            elif params is not DEFAULT and close is DEFAULT and commit is DEFAULT:
+            elif params is not DEFAULT and commit is DEFAULT:
                 reply = await self.con.execute(sql, params=params)
-            elif params is DEFAULT and close is not DEFAULT and commit is DEFAULT:
-                reply = await self.con.execute(sql, close=close)
-            elif params is not DEFAULT and close is not DEFAULT and commit is DEFAULT:
-                reply = await self.con.execute(sql, params=params, close=close)
-            elif params is DEFAULT and close is DEFAULT and commit is not DEFAULT:
+            elif params is DEFAULT and commit is not DEFAULT:
                 reply = await self.con.execute(sql, commit=commit)
-            elif params is not DEFAULT and close is DEFAULT and commit is not DEFAULT:
+            else:
                 reply = await self.con.execute(sql, params=params, commit=commit)
-            elif params is DEFAULT and close is not DEFAULT and commit is not DEFAULT:
-                reply = await self.con.execute(sql, close=close, commit=commit)
-            elif (
-                params is not DEFAULT and close is not DEFAULT and commit is not DEFAULT
-            ):
-                reply = await self.con.execute(
-                    sql, params=params, close=close, commit=commit
-                )
             self.assertEqual(reply, mock_cur)
             MockCursor.assert_called_once_with(
                 cur=self.con._connection.cursor.return_value,
                 con=self.con,
             )
             self.con._connection.cursor.assert_called_once_with()
-            mock_cur.execute.assert_awaited_once_with(sql, params=ANY, close=ANY)
+            mock_cur.execute.assert_awaited_once_with(sql, params=ANY)
             if commit is DEFAULT:
                 self.assertEqual(self.con.commit, sentinel.COMMIT)
             else:
@@ -228,23 +225,28 @@ class TestSQLiteConnection(unittest.IsolatedAsyncioTestCase):
 
     async def test_201_execute(self):
         exec = await self._201_execute()
-        exec.assert_awaited_once_with(ANY, params=None, close=False)
+        exec.assert_awaited_once_with(ANY, params=None)
         exec = await self._201_execute(params=sentinel.PARAMS)
-        exec.assert_awaited_once_with(ANY, params=sentinel.PARAMS, close=False)
-        exec = await self._201_execute(close=sentinel.CLOSE)
-        exec.assert_awaited_once_with(ANY, params=None, close=sentinel.CLOSE)
-        exec = await self._201_execute(params=sentinel.PARAMS, close=sentinel.CLOSE)
-        exec.assert_awaited_once_with(ANY, params=sentinel.PARAMS, close=sentinel.CLOSE)
+        exec.assert_awaited_once_with(ANY, params=sentinel.PARAMS)
         exec = await self._201_execute(commit=sentinel.COMMIT)
-        exec.assert_awaited_once_with(ANY, params=None, close=False)
+        exec.assert_awaited_once_with(ANY, params=None)
         exec = await self._201_execute(params=sentinel.PARAMS, commit=sentinel.COMMIT)
-        exec.assert_awaited_once_with(ANY, params=sentinel.PARAMS, close=False)
-        exec = await self._201_execute(close=sentinel.CLOSE, commit=sentinel.COMMIT)
-        exec.assert_awaited_once_with(ANY, params=None, close=sentinel.CLOSE)
-        exec = await self._201_execute(
-            params=sentinel.PARAMS, close=sentinel.CLOSE, commit=sentinel.COMMIT
+        exec.assert_awaited_once_with(ANY, params=sentinel.PARAMS)
+
+    async def test_301_executemany(self):
+        mock_aiocursor = AsyncMock()
+        mock_aiocursor.rowcount = 2
+        self.con._connection = AsyncMock()
+        self.con._connection.executemany.return_value = mock_aiocursor
+        reply = await self.con.executemany(
+            sentinel.SQL, sentinel.PARAMS_SEQ, commit=True
+        )
+        self.assertEqual(reply, 2)
+        self.assertTrue(self.con._commit)
+        self.con._connection.executemany.assert_awaited_once_with(
+            sentinel.SQL, sentinel.PARAMS_SEQ
         )
-        exec.assert_awaited_once_with(ANY, params=sentinel.PARAMS, close=sentinel.CLOSE)
+        mock_aiocursor.close.assert_awaited_once_with()
 
 
 @asynccontextmanager
@@ -261,22 +263,16 @@ class TestSQLiteCursor(unittest.IsolatedAsyncioTestCase):
         self.mock_con.close = self.mock_con_close
         return super().setUp()
 
-    async def _101_execute(self, params=DEFAULT, close=DEFAULT):
+    async def _101_execute(self, params=DEFAULT):
         query = "ANY_SQL"
-        self.cur._last_query = "PREV_SQL"
         self.mock_aiocursor.reset_mock()
         self.mock_aiocursor.rowcount = 99
         self.cur._rowcount = 0
-        if params is DEFAULT and close is DEFAULT:
+        if params is DEFAULT:
             reply = await self.cur.execute(query)
-        elif params is not DEFAULT and close is DEFAULT:
+        else:
             reply = await self.cur.execute(query, params=params)
-        elif params is DEFAULT and close is not DEFAULT:
-            reply = await self.cur.execute(query, close=close)
-        elif params is not DEFAULT and close is not DEFAULT:
-            reply = await self.cur.execute(query, params=params, close=close)
         self.assertEqual(reply, self.cur)
-        self.assertEqual(self.cur._last_query, query)
         self.assertEqual(self.cur._rowcount, 99)
         self.mock_aiocursor.execute.assert_awaited_once_with(query, ANY)
         return self.mock_aiocursor.execute
@@ -286,9 +282,24 @@ class TestSQLiteCursor(unittest.IsolatedAsyncioTestCase):
         result.assert_awaited_once_with(ANY, None)
         result = await self._101_execute(sentinel.PARAMS)
         result.assert_awaited_once_with(ANY, sentinel.PARAMS)
-        result = await self._101_execute(close=0)
+        self.mock_aiocursor.close.assert_not_awaited()
 
-        result.assert_awaited_once_with(ANY, None)
+    async def test_103_execute_error(self):
+        class MockOperationalError(Exception):
+            pass
+
+        self.mock_aiocursor.execute.side_effect = MockOperationalError
+        with (
+            patch(
+                "db.sqlite.sqlite3",
+                Mock(OperationalError=MockOperationalError),
+                create=True,
+            ),
+            self.assertRaises(db.sqlite.OperationalError),
+        ):
+            await self.cur.execute("ANY_SQL")
+        self.mock_aiocursor.close.assert_awaited_once_with()
+        self.mock_con_close.assert_not_awaited()
 
     async def test_201_rowcount_get_11(self):
         self.cur._rowcount = 11
@@ -304,17 +315,55 @@ class TestSQLiteCursor(unittest.IsolatedAsyncioTestCase):
 
     async def test_201_rowcount_get_minus_1(self):
         self.cur._rowcount = -1
-        self.cur._last_sql = "PREV_SQL"
-        mock_sqlite_con_execute = AsyncMock(spec_async_context_manager())
-        self.mock_con._connection.execute.return_value = mock_sqlite_con_execute
-        mock_subcur = AsyncMock()
-        mock_sqlite_con_execute.__aenter__.return_value = mock_subcur
-        mock_subcur.fetchone.return_value = (22, "mick")
+        self.mock_aiocursor.fetchall.return_value = [{"id": 1}, {"id": 2}]
         reply = await self.cur.rowcount
-        self.assertEqual(reply, 22)
-        self.mock_con._connection.execute.assert_called_once_with(
-            f"SELECT COUNT(*) FROM ({self.cur._last_sql})"
+        self.assertEqual(reply, 2)
+        self.mock_aiocursor.fetchall.assert_awaited_once_with()
+        self.mock_con._connection.execute.assert_not_called()
+        self.assertEqual(await self.cur.rowcount, 2)
+        self.mock_aiocursor.fetchall.assert_awaited_once_with()
+        self.assertEqual(await self.cur.fetchone(), {"id": 1})
+        self.assertEqual(await self.cur.fetchall(), [{"id": 2}])
+        self.assertIsNone(await self.cur.fetchone())
+        self.mock_aiocursor.fetchone.assert_not_awaited()
+        await self.cur.close()
+        self.mock_aiocursor.close.assert_awaited_once_with()
+
+
+class TestSQLiteBatchValues(MockDBMixin, unittest.TestCase):
+    sql_factory = db.sqlite.SQLiteSQLFactory
+
+    def test_001_rows_batch(self):
+        rows = [(1, "a"), (2, "b")]
+        insert = db.sqlite.SQL().insert("users").rows_batch(["id", "name"], rows)
+        self.assertEqual(insert.sql(), "INSERT INTO users (id, name) VALUES (?, ?)")
+        self.assertIs(insert.batch_params(), rows)
+
+    def test_002_columns_batch(self):
+        insert = db.sqlite.SQL().insert("users").columns_batch(
+            {"id": [1, 2], "name": ["a", "b"]}
         )
-        mock_sqlite_con_execute.__aenter__.assert_awaited_once_with()
-        mock_sqlite_con_execute.__aexit__.assert_awaited_once_with(None, None, None)
-        mock_subcur.fetchone.assert_awaited_once_with()
+        self.assertEqual(insert.sql(), "INSERT INTO users (id, name) VALUES (?, ?)")
+        self.assertEqual(insert.batch_params(), [(1, "a"), (2, "b")])
+
+    def test_003_bound_row(self):
+        insert = db.sqlite.SQL().insert("users").bound_row([("id", 1), ("name", "a")])
+        self.assertEqual(insert.sql(), "INSERT INTO users (id, name) VALUES (?, ?)")
+        self.assertEqual(insert.bound_params(), (1, "a"))
+
+
+class TestSQLiteRow(unittest.TestCase):
+    def test_001_mapping(self):
+        index = {"id": 0, "name": 1}
+        row = db.sqlite.SQLiteRow(index, (1, "a"))
+        self.assertEqual(row, {"id": 1, "name": "a"})
+        self.assertEqual(row["name"], "a")
+        self.assertEqual(row.get("id"), 1)
+        self.assertIsNone(row.get("other"))
+        self.assertIn("id", row)
+        self.assertNotIn(1, row)
+        self.assertEqual(list(row), ["id", "name"])
+        self.assertEqual(dict(row), {"id": 1, "name": "a"})
+        self.assertEqual(repr(row), "{'id': 1, 'name': 'a'}")
+        with self.assertRaises(KeyError):
+            row["other"]
@@ -0,0 +1,77 @@
+""" Test suite for the business object base class """
+
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
+
+from persistance.bo_descriptors import BOInt, BOStr
+from persistance.business_object_base import BOBase
+from db.sqlfactory import SQLFactory
+
+
+class TestAttributes(unittest.TestCase):
+    def setUp(self) -> None:
+        class Parent(BOBase):
+            name = BOStr()
+
+        class Child(Parent):
+            count = BOInt()
+
+        self.Parent = Parent
+        self.Child = Child
+        self.addCleanup(BOBase._attributes.pop, "Parent", None)
+        self.addCleanup(BOBase._attributes.pop, "Child", None)
+        return super().setUp()
+
+    def test_101_attribute_descriptions(self):
+        self.assertEqual(
+            [a[0] for a in self.Child.attribute_descriptions()],
+            ["id", "last_updated", "name", "count"],
+        )
+        self.assertEqual(self.Child.attributes_as_dict()["count"], int)
+
+    def test_201_attribute_added(self):
+        self.Child.attribute_descriptions()
+        self.Child.attributes_as_dict()
+        attr = BOInt()
+        self.Parent.size = attr
+        attr.__set_name__(self.Parent, "size")
+        self.assertEqual(
+            [a[0] for a in self.Child.attribute_descriptions()],
+            ["id", "last_updated", "name", "size", "count"],
+        )
+        self.assertEqual(self.Child.attributes_as_dict()["size"], int)
+
+
+class TestStore(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        class Item(BOBase):
+            name = BOStr()
+            count = BOInt()
+
+        self.Item = Item
+        self.addCleanup(BOBase._attributes.pop, "Item", None)
+        self.mock_con = AsyncMock()
+
+        @asynccontextmanager
+        async def acquire():
+            yield self.mock_con
+
+        self.mock_db = Mock(sql_factory=SQLFactory, acquire=acquire)
+        return super().setUp()
+
+    async def test_101_update_binds_values(self):
+        item = self.Item(id=7)
+        item._db_data = {"id": 7, "last_updated": None, "name": "a", "count": 1}
+        item._data.update(item._db_data)
+        item._data["name"] = "b'; --"
+        with (
+            patch("persistance.business_object_base.App.db", self.mock_db),
+            patch.object(self.Item, "fetch", AsyncMock()),
+        ):
+            await item._update_self()
+        self.mock_con.execute.assert_awaited_once_with(
+            "UPDATE items SET name = :name WHERE  (id = :id) ",
+            {"id": 7, "name": "b'; --"},
+            commit=True,
+        )